@@ -1,19 +1,52 @@
 """FastAPI application entry point."""
 
+import argparse
+import asyncio
+import os
+import signal
+import threading
 from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from truthguards.api.routes import router
-from truthguards.core.config import get_settings
+from truthguards.core.config import get_settings, reload_settings
 from truthguards.core.weaviate_client import get_weaviate_client
 
 
+def _install_reload_handler() -> None:
+    """Reload settings on SIGHUP, where the platform and current thread allow it."""
+    if not hasattr(signal, "SIGHUP") or threading.current_thread() is not threading.main_thread():
+        return
+    asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload_settings)
+
+
+def _warm_up_models() -> None:
+    """Load the local models used for search so the first request does not pay for it."""
+    settings = get_settings()
+    uses_mmr = settings.rerank.enabled and settings.rerank.provider == "mmr"
+    if settings.embeddings.enabled or settings.embeddings.ingest or uses_mmr:
+        from truthguards.core.embeddings import get_batcher, get_embedder
+
+        # Loads the session and tokenizer once per worker and runs a first forward pass
+        get_embedder().encode_batch(["warm up"])
+        if settings.embeddings.ingest:
+            get_batcher()  # Starts the ingest batching thread
+
+    if settings.rerank.enabled and settings.rerank.provider == "cross-encoder":
+        from truthguards.core.weaviate_client import _load_cross_encoder
+
+        _load_cross_encoder(settings.rerank.model, settings.rerank.backend)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle."""
+    _install_reload_handler()
+
     # Startup: connect to Weaviate
     client = get_weaviate_client()
     try:
@@ -21,6 +54,11 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"Warning: Could not connect to Weaviate: {e}")
 
+    try:
+        _warm_up_models()
+    except Exception as e:
+        print(f"Warning: Could not load search models: {e}")
+
     yield
 
     # Shutdown: close Weaviate connection
@@ -51,12 +89,15 @@ to every prompt, only the most relevant ones are retrieved using hybrid search
 # Add CORS middleware for Streamlit and other frontends
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, restrict this
+    allow_origins=get_settings().api.allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress larger responses; search results are repetitive text and shrink well
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
 # Include API routes
 app.include_router(router, prefix="/api/v1")
 
@@ -67,12 +108,51 @@ app.include_router(router)
 
 def run():
     """Run the API server."""
+    parser = argparse.ArgumentParser(description="Run the TruthGuards API server.")
+    parser.add_argument(
+        "--prod",
+        action="store_true",
+        help="Run multiple Uvicorn workers under Gunicorn",
+    )
+    args = parser.parse_args()
+
+    if args.prod:
+        run_prod()
+        return
+
     settings = get_settings()
     uvicorn.run(
         "truthguards.api.main:app",
         host=settings.api.host,
         port=settings.api.port,
-        reload=True,
+        reload=settings.api.dev_mode,
+    )
+
+
+def _available_cpus() -> int:
+    """Count the CPUs this process may run on, like `nproc` (respects cpusets)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def run_prod():
+    """Replace the current process with a Gunicorn server running Uvicorn workers."""
+    settings = get_settings()
+    workers = os.environ.get("TRUTHGUARDS_WORKERS") or str(2 * _available_cpus() + 1)
+
+    os.execvp(
+        "gunicorn",
+        [
+            "gunicorn",
+            "truthguards.api.main:app",
+            "--worker-class", "uvicorn_worker.UvicornWorker",
+            "--workers", workers,
+            "--bind", f"{settings.api.host}:{settings.api.port}",
+            "--timeout", "60",
+            "--keep-alive", "5",
+            "--graceful-timeout", "30",
+        ],
     )
 
 
@@ -1,8 +1,17 @@
 """API routes for TruthGuards."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from collections.abc import AsyncIterator
+from typing import Any
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from truthguards.api.schemas import (
+    BulkGuardrailCreate,
+    BulkGuardrailCreated,
+    BulkGuardrailFailure,
     GuardrailCreate,
     GuardrailCreated,
     GuardrailResponse,
@@ -11,9 +20,12 @@ from truthguards.api.schemas import (
     SearchRequest,
     SearchResponse,
 )
+from truthguards.core import config
 from truthguards.core.config import get_settings
 from truthguards.core.weaviate_client import WeaviateClient, get_weaviate_client
 
+# The Weaviate client is synchronous, so routes call it through
+# `run_in_threadpool` to keep a slow query from blocking the event loop.
 router = APIRouter()
 
 
@@ -25,12 +37,7 @@ def get_client() -> WeaviateClient:
 @router.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check(client: WeaviateClient = Depends(get_client)) -> HealthResponse:
     """Check the health of the service."""
-    try:
-        # Try to access Weaviate
-        client.client.is_ready()
-        weaviate_connected = True
-    except Exception:
-        weaviate_connected = False
+    weaviate_connected = await run_in_threadpool(client.is_ready)
 
     return HealthResponse(
         status="healthy" if weaviate_connected else "degraded",
@@ -61,17 +68,16 @@ async def create_guardrail(
     This endpoint stores a guardrail that will be retrieved when searching
     for prompts similar to the one provided.
     """
-    settings = get_settings()
-
     # Validate model name if models are configured
-    if settings.models and guardrail.model_name not in settings.models:
+    if config.MODELS_SET and guardrail.model_name not in config.MODELS_SET:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid model name. Available models: {settings.models}",
+            detail=f"Invalid model name. Available models: {get_settings().models}",
         )
 
     try:
-        guardrail_id = client.add_guardrail(
+        guardrail_id = await run_in_threadpool(
+            client.add_guardrail,
             prompt=guardrail.prompt,
             model_name=guardrail.model_name,
             guardrails=guardrail.guardrails,
@@ -84,6 +90,59 @@ async def create_guardrail(
         )
 
 
+@router.post(
+    "/guardrails/bulk",
+    response_model=BulkGuardrailCreated,
+    status_code=status.HTTP_201_CREATED,
+    responses={207: {"model": BulkGuardrailCreated, "description": "Some guardrails failed"}},
+    tags=["Guardrails"],
+)
+async def create_guardrails_bulk(
+    bulk: BulkGuardrailCreate,
+    response: Response,
+    client: WeaviateClient = Depends(get_client),
+) -> BulkGuardrailCreated:
+    """
+    Add many guardrails in a single request.
+
+    Guardrails are inserted through Weaviate's batch API, which is much faster
+    than calling `POST /guardrails` once per item for large imports.
+
+    If only some guardrails could be stored, the response has status 207 and
+    lists the request index and error of each guardrail in `failed`; the
+    others were written and should not be resent.
+    """
+    # Validate every model name before writing anything
+    if config.MODELS_SET:
+        invalid = sorted({g.model_name for g in bulk.guardrails} - config.MODELS_SET)
+        if invalid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid model name(s) {invalid}. Available models: {get_settings().models}",
+            )
+
+    try:
+        result = await run_in_threadpool(
+            client.add_guardrails_bulk, [g.model_dump() for g in bulk.guardrails]
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create guardrails: {str(e)}",
+        )
+
+    if not result.failed:
+        return BulkGuardrailCreated(ids=result.ids, count=len(result.ids))
+
+    response.status_code = status.HTTP_207_MULTI_STATUS
+    return BulkGuardrailCreated(
+        ids=result.ids,
+        count=len(result.ids),
+        failed=[BulkGuardrailFailure(**f) for f in result.failed],
+        message=f"{len(result.failed)} of {len(bulk.guardrails)} guardrails failed to insert",
+    )
+
+
 @router.post("/guardrails/search", response_model=SearchResponse, tags=["Guardrails"])
 async def search_guardrails(
     search: SearchRequest,
@@ -93,26 +152,26 @@ async def search_guardrails(
     Search for relevant guardrails using hybrid search.
 
     This endpoint uses a combination of keyword and semantic search to find
-    guardrails that are relevant to the provided prompt.
+    guardrails that are relevant to the provided prompt. Keyword and vector
+    rankings are merged with reciprocal rank fusion by default.
+
+    `alpha` overrides the configured keyword/vector balance for this request.
+    Higher values (the default is 0.7) favour semantically similar guardrails,
+    which suits conversational prompts. Lower values favour exact term matches,
+    e.g. for prompts built around product names or error codes.
     """
     try:
-        results = client.search_guardrails(
+        results = await run_in_threadpool(
+            client.search_guardrails_raw,
             prompt=search.prompt,
             model_name=search.model_name,
             limit=search.limit,
+            alpha=search.alpha,
         )
 
-        return SearchResponse(
-            results=[
-                GuardrailResponse(
-                    id=r.id,
-                    prompt=r.prompt,
-                    model_name=r.model_name,
-                    guardrails=r.guardrails,
-                    score=r.score,
-                )
-                for r in results
-            ],
+        # Hits come straight from Weaviate with known types, skip re-validation
+        return SearchResponse.model_construct(
+            results=[GuardrailResponse.model_construct(**hit) for hit in results],
             count=len(results),
         )
     except Exception as e:
@@ -122,13 +181,54 @@ async def search_guardrails(
         )
 
 
+@router.post(
+    "/guardrails/search/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+    tags=["Guardrails"],
+)
+async def search_guardrails_stream(
+    search: SearchRequest,
+    client: WeaviateClient = Depends(get_client),
+) -> StreamingResponse:
+    """
+    Search for relevant guardrails, streaming results as newline-delimited JSON.
+
+    Takes the same body as `POST /guardrails/search`. Each line of the response
+    is one guardrail in the `GuardrailResponse` shape, in ranking order. Clients
+    can start using the top results before the rest are sent, which helps for
+    large limits.
+    """
+    try:
+        results = await run_in_threadpool(
+            client.search_guardrails_raw,
+            prompt=search.prompt,
+            model_name=search.model_name,
+            limit=search.limit,
+            alpha=search.alpha,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Search failed: {str(e)}",
+        )
+
+    return StreamingResponse(_ndjson_lines(results), media_type="application/x-ndjson")
+
+
+async def _ndjson_lines(hits: list[dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode each search hit as one JSON line."""
+    for hit in hits:
+        yield orjson.dumps(hit) + b"\n"
+
+
 @router.get("/guardrails/{guardrail_id}", response_model=GuardrailResponse, tags=["Guardrails"])
 async def get_guardrail(
     guardrail_id: str,
     client: WeaviateClient = Depends(get_client),
 ) -> GuardrailResponse:
     """Get a specific guardrail by ID."""
-    result = client.get_guardrail(guardrail_id)
+    result = await run_in_threadpool(client.get_guardrail, guardrail_id)
     if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -153,7 +253,7 @@ async def delete_guardrail(
     client: WeaviateClient = Depends(get_client),
 ) -> None:
     """Delete a guardrail by ID."""
-    success = client.delete_guardrail(guardrail_id)
+    success = await run_in_threadpool(client.delete_guardrail, guardrail_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
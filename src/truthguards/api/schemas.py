@@ -1,6 +1,6 @@
 """Pydantic schemas for API request/response models."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class GuardrailCreate(BaseModel):
@@ -10,8 +10,9 @@ class GuardrailCreate(BaseModel):
     model_name: str = Field(..., description="The LLM model this guardrail is for")
     guardrails: str = Field(..., description="The guardrail text to add to prompts")
 
-    model_config = {
-        "json_schema_extra": {
+    model_config = ConfigDict(
+        extra="forbid",
+        json_schema_extra={
             "examples": [
                 {
                     "prompt": "What is the capital of France?",
@@ -19,8 +20,8 @@ class GuardrailCreate(BaseModel):
                     "guardrails": "Always verify factual information before responding. If uncertain, clearly state that the information should be verified.",
                 }
             ]
-        }
-    }
+        },
+    )
 
 
 class GuardrailResponse(BaseModel):
@@ -31,6 +32,14 @@ class GuardrailResponse(BaseModel):
     model_name: str = Field(..., description="The LLM model this guardrail is for")
     guardrails: str = Field(..., description="The guardrail text")
     score: float = Field(..., description="Relevance score from hybrid search (0-1)")
+    rerank_score: float | None = Field(
+        default=None,
+        description=(
+            "Score from the configured rerank provider, when reranking is enabled: "
+            "cross-encoder relevance, the Weaviate reranker module's score, or "
+            "cosine similarity to the prompt for MMR"
+        ),
+    )
 
 
 class GuardrailCreated(BaseModel):
@@ -40,15 +49,50 @@ class GuardrailCreated(BaseModel):
     message: str = Field(default="Guardrail created successfully")
 
 
+class BulkGuardrailCreate(BaseModel):
+    """Request body for creating many guardrails at once."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    guardrails: list[GuardrailCreate] = Field(
+        ..., min_length=1, description="Guardrails to create in a single batch"
+    )
+
+
+class BulkGuardrailFailure(BaseModel):
+    """A guardrail from a bulk request that could not be stored."""
+
+    index: int = Field(..., description="Position of the guardrail in the request")
+    message: str = Field(..., description="Error reported by Weaviate")
+
+
+class BulkGuardrailCreated(BaseModel):
+    """Response after creating guardrails in bulk."""
+
+    ids: list[str] = Field(..., description="Identifiers of the created guardrails, in request order")
+    count: int = Field(..., description="Number of guardrails created")
+    failed: list[BulkGuardrailFailure] = Field(
+        default_factory=list, description="Guardrails that were not stored"
+    )
+    message: str = Field(default="Guardrails created successfully")
+
+
 class SearchRequest(BaseModel):
     """Request body for searching guardrails."""
 
     prompt: str = Field(..., description="The prompt to search for relevant guardrails")
     model_name: str = Field(..., description="Filter by LLM model")
     limit: int = Field(default=5, ge=1, le=100, description="Maximum number of results")
-
-    model_config = {
-        "json_schema_extra": {
+    alpha: float | None = Field(
+        default=None,
+        ge=0,
+        le=1,
+        description="Balance between keyword (0) and vector (1) search, defaults to the configured value",
+    )
+
+    model_config = ConfigDict(
+        extra="forbid",
+        json_schema_extra={
             "examples": [
                 {
                     "prompt": "Tell me about historical events",
@@ -56,8 +100,8 @@ class SearchRequest(BaseModel):
                     "limit": 5,
                 }
             ]
-        }
-    }
+        },
+    )
 
 
 class SearchResponse(BaseModel):
@@ -1 +1,8 @@
 """TruthGuards core module."""
+
+import os
+
+# Set before `tokenizers` is imported by the embedder or the cross-encoder. Its
+# thread pool does not survive Gunicorn's fork and only adds contention between
+# workers, while each request tokenizes a handful of short texts anyway.
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
@@ -3,6 +3,7 @@
 import os
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 import yaml
 from pydantic import BaseModel
@@ -22,6 +23,8 @@ class ApiConfig(BaseModel):
 
     host: str = "0.0.0.0"
     port: int = 8000
+    dev_mode: bool = False
+    allowed_origins: list[str] = ["http://localhost:8501"]
 
 
 class StreamlitConfig(BaseModel):
@@ -34,7 +37,44 @@ class SearchConfig(BaseModel):
     """Hybrid search configuration."""
 
     default_limit: int = 5
-    alpha: float = 0.5
+    alpha: float = 0.7
+    # "ranked" (reciprocal rank fusion) or "relative_score"
+    fusion_type: Literal["ranked", "relative_score"] = "ranked"
+    cache_size: int = 1024
+    cache_ttl: float = 30.0  # Seconds, 0 disables the search result cache
+
+
+class RerankConfig(BaseModel):
+    """Search result reranking configuration."""
+
+    enabled: bool = False
+    # "cross-encoder" (in-process), "weaviate" (reranker module) or "mmr" (diversify)
+    provider: Literal["cross-encoder", "weaviate", "mmr"] = "cross-encoder"
+    model: str = "cross-encoder/ms-marco-MiniLM-L-2-v2"
+    backend: Literal["onnx", "torch"] = "onnx"
+    candidate_multiplier: int = 4
+    mmr_lambda: float = 0.5  # Relevance (1) vs diversity (0) trade-off for "mmr"
+
+
+class EmbeddingConfig(BaseModel):
+    """Local embedding configuration."""
+
+    enabled: bool = False
+    # Must be an ONNX export of the model the Weaviate vectorizer runs
+    model_dir: str = "models/multi-qa-MiniLM-L6-cos-v1"
+    quantized: bool = True  # Load the INT8 model, False falls back to FP32
+    cache_size: int = 4096
+    # Also embed guardrails on ingest instead of using Weaviate's vectorizer
+    ingest: bool = False
+    max_batch: int = 64
+    max_wait_ms: float = 3.0
+
+
+class IngestConfig(BaseModel):
+    """Batch ingestion configuration."""
+
+    batch_size: int = 100
+    concurrent_requests: int = 2
 
 
 class Settings(BaseSettings):
@@ -45,13 +85,26 @@ class Settings(BaseSettings):
     api: ApiConfig = ApiConfig()
     streamlit: StreamlitConfig = StreamlitConfig()
     search: SearchConfig = SearchConfig()
+    rerank: RerankConfig = RerankConfig()
+    embeddings: EmbeddingConfig = EmbeddingConfig()
+    ingest: IngestConfig = IngestConfig()
 
     class Config:
         env_prefix = "TRUTHGUARDS_"
 
 
+# The C loader is several times faster, fall back when libyaml is unavailable
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_found_config_path: Path | None = None
+
+
 def find_config_file() -> Path | None:
     """Find the config file in common locations."""
+    global _found_config_path
+    if _found_config_path is not None and _found_config_path.exists():
+        return _found_config_path
+
     search_paths = [
         Path("config/config.yaml"),
         Path("config.yaml"),
@@ -61,11 +114,19 @@ def find_config_file() -> Path | None:
 
     for path in search_paths:
         if path.exists():
+            _found_config_path = path
             return path
 
     return None
 
 
+@lru_cache(maxsize=8)
+def _parse_yaml(path: str, mtime_ns: int) -> dict:
+    """Parse a YAML file, cached until the file is modified."""
+    with open(path) as f:
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
+
+
 def load_config_from_yaml(config_path: Path | None = None) -> dict:
     """Load configuration from YAML file."""
     if config_path is None:
@@ -74,8 +135,7 @@ def load_config_from_yaml(config_path: Path | None = None) -> dict:
     if config_path is None or not config_path.exists():
         return {}
 
-    with open(config_path) as f:
-        return yaml.safe_load(f) or {}
+    return dict(_parse_yaml(str(config_path), config_path.stat().st_mtime_ns))
 
 
 @lru_cache
@@ -86,3 +146,27 @@ def get_settings() -> Settings:
 
     yaml_config = load_config_from_yaml(config_path)
     return Settings(**yaml_config)
+
+
+# Hot-path values resolved once from the settings. Read them through the module
+# (`config.MODELS_SET`) so that `reload_settings` rebinding is picked up.
+MODELS_SET: frozenset[str] = frozenset()
+DEFAULT_LIMIT: int = SearchConfig().default_limit
+
+
+def _bind_settings() -> None:
+    """Resolve the module-level bindings from the current settings."""
+    global MODELS_SET, DEFAULT_LIMIT
+    settings = get_settings()
+    MODELS_SET = frozenset(settings.models)
+    DEFAULT_LIMIT = settings.search.default_limit
+
+
+def reload_settings() -> Settings:
+    """Re-read the configuration and rebuild the module-level bindings."""
+    get_settings.cache_clear()
+    _bind_settings()
+    return get_settings()
+
+
+_bind_settings()
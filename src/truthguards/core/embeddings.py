@@ -0,0 +1,242 @@
+"""Local ONNX Runtime embedder for query and guardrail vectors."""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import onnxruntime as ort
+import xxhash
+from cachetools import LRUCache
+from tokenizers import Tokenizer
+
+from truthguards.core.config import get_settings
+
+MAX_SEQUENCE_LENGTH = 512
+PAD_MULTIPLE = 8
+PAD_ID = 0
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model-int8.onnx"
+
+
+class LocalEmbedder:
+    """
+    Sentence embedder running an exported transformer with ONNX Runtime.
+
+    The model directory must contain `tokenizer.json` and `model.onnx`, as
+    produced by `optimum-cli export onnx --task feature-extraction`, plus
+    `model-int8.onnx` when `quantized` is set (see `quantize_model`). Token
+    embeddings are mean-pooled and L2-normalized, matching sentence-transformers.
+    """
+
+    def __init__(self, model_dir: str | Path, cache_size: int = 4096, quantized: bool = True):
+        """Load the ONNX session and tokenizer from `model_dir`."""
+        model_dir = Path(model_dir)
+        sess_options = ort.SessionOptions()
+        sess_options.enable_cpu_mem_arena = True
+        sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_dir / (QUANTIZED_MODEL_FILE if quantized else MODEL_FILE)),
+            sess_options=sess_options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+        # Padding is done when packing encodings into arrays, so each batch is
+        # only padded to its own longest text
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(MAX_SEQUENCE_LENGTH)
+        self.tokenizer.no_padding()
+
+        self._cache: LRUCache = LRUCache(maxsize=cache_size)
+        self._cache_lock = threading.Lock()
+
+    def encode(self, text: str) -> np.ndarray:
+        """Embed a single text, reusing the vector for texts seen recently."""
+        key = xxhash.xxh64_intdigest(text.encode())
+        with self._cache_lock:
+            vector = self._cache.get(key)
+        if vector is not None:
+            return vector
+
+        vector = self.encode_batch([text])[0]
+        vector.setflags(write=False)  # Shared between callers through the cache
+        with self._cache_lock:
+            self._cache[key] = vector
+        return vector
+
+    def encode_batch(self, texts: list[str]) -> np.ndarray:
+        """Embed several texts in one forward pass, returning a (n, dim) float32 array."""
+        input_ids, attention_mask = self._tokenize(texts)
+        return self._embed(input_ids, attention_mask)
+
+    def encode_many(self, texts: list[str], batch_size: int = 64) -> np.ndarray:
+        """
+        Embed a large number of texts in length-sorted mini-batches.
+
+        Texts are sorted by token count and each mini-batch is only padded to
+        its own longest text instead of the longest text overall, so short
+        texts do not pay attention cost for padding. Mini-batches are packed
+        into one pair of reused buffers. Vectors are returned in input order.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        encodings = self.tokenizer.encode_batch(texts)
+        lengths = np.fromiter((len(e.ids) for e in encodings), dtype=np.int64, count=len(texts))
+        order = np.argsort(lengths, kind="stable")
+
+        # Flat buffers sized for the widest mini-batch; each batch takes a
+        # contiguous (n, width) view from the front
+        buffer_size = min(batch_size, len(texts)) * _padded_width(int(lengths.max()))
+        ids_buffer = np.empty(buffer_size, dtype=np.int64)
+        mask_buffer = np.empty(buffer_size, dtype=np.int64)
+
+        vectors: np.ndarray | None = None
+        for start in range(0, len(texts), batch_size):
+            rows = order[start : start + batch_size]
+            width = _padded_width(int(lengths[rows[-1]]))  # Sorted, so the last is longest
+            input_ids = ids_buffer[: len(rows) * width].reshape(len(rows), width)
+            attention_mask = mask_buffer[: len(rows) * width].reshape(len(rows), width)
+            _pack([encodings[row] for row in rows], input_ids, attention_mask)
+
+            batch_vectors = self._embed(input_ids, attention_mask)
+            if vectors is None:
+                vectors = np.empty((len(texts), batch_vectors.shape[1]), dtype=np.float32)
+            vectors[rows] = batch_vectors
+
+        return vectors  # type: ignore[return-value]
+
+    def _tokenize(self, texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Tokenize texts into padded (input_ids, attention_mask) arrays."""
+        encodings = self.tokenizer.encode_batch(texts)
+        width = _padded_width(max(len(e.ids) for e in encodings))
+        input_ids = np.empty((len(texts), width), dtype=np.int64)
+        attention_mask = np.empty((len(texts), width), dtype=np.int64)
+        _pack(encodings, input_ids, attention_mask)
+        return input_ids, attention_mask
+
+    def _embed(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """Run the model on tokenized inputs and pool into sentence vectors."""
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self.session.run(None, inputs)[0]
+        return _mean_pool(token_embeddings, attention_mask)
+
+
+class EmbeddingBatcher:
+    """
+    Groups concurrent `encode` calls into batched forward passes.
+
+    Callers block on a future while a background thread drains the queue for
+    up to `max_wait` seconds (or `max_batch` texts) and embeds the whole group
+    in one `encode_batch` call.
+    """
+
+    def __init__(self, embedder: LocalEmbedder, max_batch: int = 64, max_wait: float = 0.003):
+        """Start the background batching thread."""
+        self.embedder = embedder
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: queue.Queue[tuple[str, Future]] = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def encode(self, text: str) -> np.ndarray:
+        """Embed a text as part of the next batch, blocking until it is done."""
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def _run(self) -> None:
+        """Collect pending texts into batches and embed them, forever."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                vectors = self.embedder.encode_batch([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+
+def quantize_model(model_dir: str | Path) -> Path:
+    """
+    Write an INT8 dynamically quantized copy of the model next to the FP32 one.
+
+    Args:
+        model_dir: Directory containing the exported `model.onnx`
+
+    Returns:
+        Path of the quantized model
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    model_dir = Path(model_dir)
+    quantized_path = model_dir / QUANTIZED_MODEL_FILE
+    quantize_dynamic(model_dir / MODEL_FILE, quantized_path, weight_type=QuantType.QInt8)
+    return quantized_path
+
+
+def _padded_width(length: int) -> int:
+    """Round a token count up to the padding multiple."""
+    return max(-(-length // PAD_MULTIPLE) * PAD_MULTIPLE, PAD_MULTIPLE)
+
+
+def _pack(encodings: list, input_ids: np.ndarray, attention_mask: np.ndarray) -> None:
+    """Write unpadded encodings into right-padded id and mask arrays in place."""
+    input_ids.fill(PAD_ID)
+    attention_mask.fill(0)
+    for row, encoding in enumerate(encodings):
+        length = len(encoding.ids)
+        input_ids[row, :length] = encoding.ids
+        attention_mask[row, :length] = 1
+
+
+def _mean_pool(token_embeddings: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """Average token embeddings over non-padding positions and L2-normalize."""
+    mask = attention_mask[..., np.newaxis].astype(np.float32)
+    summed = (token_embeddings * mask).sum(axis=1)
+    pooled = summed / np.clip(mask.sum(axis=1), 1e-9, None)
+    pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+    return pooled.astype(np.float32, copy=False)
+
+
+@lru_cache
+def get_embedder() -> LocalEmbedder:
+    """Get the process-wide embedder, loading the model on first use."""
+    settings = get_settings()
+    return LocalEmbedder(
+        settings.embeddings.model_dir,
+        cache_size=settings.embeddings.cache_size,
+        quantized=settings.embeddings.quantized,
+    )
+
+
+@lru_cache
+def get_batcher() -> EmbeddingBatcher:
+    """Get the process-wide embedding batcher used for guardrail ingestion."""
+    settings = get_settings()
+    return EmbeddingBatcher(
+        get_embedder(),
+        max_batch=settings.embeddings.max_batch,
+        max_wait=settings.embeddings.max_wait_ms / 1000,
+    )
@@ -1,17 +1,31 @@
 """Weaviate client for storing and searching guardrails."""
 
+import threading
+import time
 import uuid
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 import weaviate
+from cachetools import TTLCache
 from weaviate.classes.config import Configure, DataType, Property
-from weaviate.classes.query import Filter, MetadataQuery
+from weaviate.classes.query import Filter, HybridFusion, MetadataQuery, Rerank
+from weaviate.collections import Collection
 
 from truthguards.core.config import get_settings
 
 COLLECTION_NAME = "Guardrail"
 
+FUSION_TYPES = {
+    "ranked": HybridFusion.RANKED,
+    "relative_score": HybridFusion.RELATIVE_SCORE,
+}
+
+# How long (in seconds) a readiness probe result is reused
+READY_CACHE_TTL = 2.0
+
 
 @dataclass
 class GuardrailResult:
@@ -22,6 +36,38 @@ class GuardrailResult:
     model_name: str
     guardrails: str
     score: float
+    rerank_score: float | None = None
+
+
+@dataclass
+class BulkInsertResult:
+    """Outcome of a bulk insert; objects not listed in `failed` were written."""
+
+    ids: list[str]
+    failed: list[dict[str, Any]]
+
+
+def _is_uuid(value: str) -> bool:
+    """Check whether a string is a valid UUID, without a round-trip to Weaviate."""
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _guardrail_text(prompt: str, guardrails: str) -> str:
+    """Build the text embedded for a guardrail from its vectorized properties."""
+    return f"{prompt} {guardrails}"
+
+
+@lru_cache
+def _load_cross_encoder(model: str, backend: str) -> Any:
+    """Load a cross-encoder reranking model once per process."""
+    # Optional dependency, only needed when reranking is enabled
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(model, backend=backend)
 
 
 class WeaviateClient:
@@ -34,21 +80,71 @@ class WeaviateClient:
         self.port = port or settings.weaviate.port
         self.grpc_port = grpc_port or settings.weaviate.grpc_port
         self._client: weaviate.WeaviateClient | None = None
+        # Routes call the client from threadpool workers, so connecting is serialized
+        self._connect_lock = threading.Lock()
+        self._collection: Collection | None = None
+        self._collection_ensured = False
+        self._ready = False
+        self._ready_cached_until: float = 0
+
+        # Search results are cached per write generation: writes bump the
+        # generation instead of clearing the cache, so old entries just expire.
+        self._search_cache: TTLCache | None = (
+            TTLCache(maxsize=settings.search.cache_size, ttl=settings.search.cache_ttl)
+            if settings.search.cache_ttl > 0
+            else None
+        )
+        self._search_cache_lock = threading.Lock()
+        self._generation = 0
 
     def connect(self) -> None:
-        """Connect to Weaviate instance."""
-        self._client = weaviate.connect_to_local(
-            host=self.host,
-            port=self.port,
-            grpc_port=self.grpc_port,
-        )
-        self._ensure_collection()
+        """Connect to Weaviate instance, reusing an open connection."""
+        if self._client is not None and self._client.is_connected():
+            return
+
+        with self._connect_lock:
+            # Another thread may have connected while this one waited
+            if self._client is not None and self._client.is_connected():
+                return
+
+            if self._client is not None:
+                # Release the dropped connection's resources before replacing it
+                try:
+                    self._client.close()
+                except Exception:
+                    pass
+
+            self._client = weaviate.connect_to_local(
+                host=self.host,
+                port=self.port,
+                grpc_port=self.grpc_port,
+            )
+            self._collection = None
+            self._ensure_collection()
+            self._collection = self._client.collections.get(COLLECTION_NAME)
 
     def close(self) -> None:
         """Close the Weaviate connection."""
-        if self._client:
-            self._client.close()
-            self._client = None
+        with self._connect_lock:
+            if self._client:
+                self._client.close()
+                self._client = None
+            self._collection = None
+            self._collection_ensured = False
+            self._ready_cached_until = 0
+
+    def is_ready(self) -> bool:
+        """Check whether Weaviate is ready, caching the result for a short time."""
+        now = time.monotonic()
+        if now < self._ready_cached_until:
+            return self._ready
+
+        try:
+            self._ready = self.client.is_ready()
+        except Exception:
+            self._ready = False
+        self._ready_cached_until = now + READY_CACHE_TTL
+        return self._ready
 
     @property
     def client(self) -> weaviate.WeaviateClient:
@@ -57,14 +153,29 @@ class WeaviateClient:
             self.connect()
         return self._client  # type: ignore
 
+    @property
+    def collection(self) -> Collection:
+        """Get the Guardrail collection handle, cached after the first lookup."""
+        if self._collection is None:
+            self._collection = self.client.collections.get(COLLECTION_NAME)
+        return self._collection
+
     def _ensure_collection(self) -> None:
         """Ensure the Guardrail collection exists."""
+        if self._collection_ensured:
+            return
+
         if self.client.collections.exists(COLLECTION_NAME):
+            self._collection_ensured = True
             return
 
+        settings = get_settings()
+        rerank_in_weaviate = settings.rerank.enabled and settings.rerank.provider == "weaviate"
+
         self.client.collections.create(
             name=COLLECTION_NAME,
             vectorizer_config=Configure.Vectorizer.text2vec_transformers(),
+            reranker_config=Configure.Reranker.transformers() if rerank_in_weaviate else None,
             properties=[
                 Property(
                     name="prompt",
@@ -84,6 +195,7 @@ class WeaviateClient:
                 ),
             ],
         )
+        self._collection_ensured = True
 
     def add_guardrail(self, prompt: str, model_name: str, guardrails: str) -> str:
         """
@@ -97,9 +209,16 @@ class WeaviateClient:
         Returns:
             The UUID of the created guardrail
         """
-        collection = self.client.collections.get(COLLECTION_NAME)
+        collection = self.collection
         guardrail_id = str(uuid.uuid4())
 
+        vector = None
+        if get_settings().embeddings.ingest:
+            from truthguards.core.embeddings import get_batcher
+
+            # Concurrent inserts share one batched forward pass
+            vector = get_batcher().encode(_guardrail_text(prompt, guardrails)).tolist()
+
         collection.data.insert(
             properties={
                 "prompt": prompt,
@@ -107,10 +226,87 @@ class WeaviateClient:
                 "guardrails": guardrails,
             },
             uuid=guardrail_id,
+            vector=vector,
         )
+        self._generation += 1
 
         return guardrail_id
 
+    def add_guardrails_bulk(self, items: Iterable[Mapping[str, str]]) -> BulkInsertResult:
+        """
+        Add many guardrails using Weaviate's batch API.
+
+        Objects are streamed in fixed-size batches so that each request to
+        Weaviate (and the vectorizer behind it) carries many guardrails at once.
+
+        Args:
+            items: Mappings with "prompt", "model_name" and "guardrails" keys
+
+        Returns:
+            The UUIDs of the created guardrails in input order, and the input
+            index and error message of each guardrail that failed to insert
+
+        Raises:
+            RuntimeError: If none of the guardrails could be inserted
+        """
+        settings = get_settings()
+        # A Collection keeps a single batch wrapper whose state (including
+        # failed_objects) is reset by every fixed_size() call, so concurrent bulk
+        # requests each need their own handle rather than the cached one.
+        collection = self.client.collections.get(COLLECTION_NAME)
+        items = list(items)
+        guardrail_ids: list[str] = []
+
+        vectors: list[Any] = [None] * len(items)
+        if settings.embeddings.ingest and items:
+            from truthguards.core.embeddings import get_embedder
+
+            vectors = get_embedder().encode_many(
+                [_guardrail_text(item["prompt"], item["guardrails"]) for item in items],
+                batch_size=settings.embeddings.max_batch,
+            ).tolist()
+
+        with collection.batch.fixed_size(
+            batch_size=settings.ingest.batch_size,
+            concurrent_requests=settings.ingest.concurrent_requests,
+        ) as batch:
+            for item, vector in zip(items, vectors):
+                guardrail_id = str(uuid.uuid4())
+                batch.add_object(
+                    properties={
+                        "prompt": item["prompt"],
+                        "model_name": item["model_name"],
+                        "guardrails": item["guardrails"],
+                    },
+                    uuid=guardrail_id,
+                    vector=vector,
+                )
+                guardrail_ids.append(guardrail_id)
+        self._generation += 1
+
+        failed_objects = collection.batch.failed_objects
+        if failed_objects and len(failed_objects) == len(guardrail_ids):
+            raise RuntimeError(
+                f"All {len(guardrail_ids)} guardrails failed to insert: "
+                f"{failed_objects[0].message}"
+            )
+
+        index_by_id = {guardrail_id: i for i, guardrail_id in enumerate(guardrail_ids)}
+        failed = sorted(
+            (
+                {
+                    "index": index_by_id[str(f.original_uuid or f.object_.uuid)],
+                    "message": f.message,
+                }
+                for f in failed_objects
+            ),
+            key=lambda f: f["index"],
+        )
+        failed_ids = {guardrail_ids[f["index"]] for f in failed}
+        return BulkInsertResult(
+            ids=[i for i in guardrail_ids if i not in failed_ids], failed=failed
+        )
+
     def search_guardrails(
         self,
         prompt: str,
@@ -130,32 +326,166 @@ class WeaviateClient:
         Returns:
             List of matching guardrails with relevance scores
         """
+        return [
+            GuardrailResult(**hit)
+            for hit in self.search_guardrails_raw(prompt, model_name, limit, alpha)
+        ]
+
+    def search_guardrails_raw(
+        self,
+        prompt: str,
+        model_name: str,
+        limit: int | None = None,
+        alpha: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Search for relevant guardrails, returning plain dicts.
+
+        Same as `search_guardrails`, but each hit is a dict with the
+        `GuardrailResult` field names as keys. This lets the API build its
+        response models directly, without an intermediate dataclass.
+        """
         settings = get_settings()
         limit = limit or settings.search.default_limit
         alpha = alpha if alpha is not None else settings.search.alpha
 
-        collection = self.client.collections.get(COLLECTION_NAME)
+        if self._search_cache is None:
+            return self._query_guardrails(prompt, model_name, limit, alpha)
+
+        key = (prompt, model_name, limit, alpha, self._generation)
+        with self._search_cache_lock:
+            hits = self._search_cache.get(key)
+        if hits is not None:
+            return hits
+
+        hits = self._query_guardrails(prompt, model_name, limit, alpha)
+        with self._search_cache_lock:
+            self._search_cache[key] = hits
+        return hits
+
+    def _query_guardrails(
+        self, prompt: str, model_name: str, limit: int, alpha: float
+    ) -> list[dict[str, Any]]:
+        """Run the hybrid query (and optional rerank) against Weaviate."""
+        settings = get_settings()
+        collection = self.collection
+
+        # Retrieve a larger candidate pool when a reranking stage follows
+        rerank = settings.rerank
+        candidate_limit = limit * rerank.candidate_multiplier if rerank.enabled else limit
+
+        rerank_in_weaviate = rerank.enabled and rerank.provider == "weaviate"
+        diversify = rerank.enabled and rerank.provider == "mmr"
+
+        # Embed the query locally so Weaviate can skip its vectorizer call
+        query_vector = None
+        vector = None
+        if settings.embeddings.enabled or diversify:
+            from truthguards.core.embeddings import get_embedder
+
+            query_vector = get_embedder().encode(prompt)
+            vector = query_vector.tolist()
 
         # Hybrid search with strict model filter
         results = collection.query.hybrid(
             query=prompt,
+            vector=vector,
             alpha=alpha,
-            limit=limit,
+            fusion_type=FUSION_TYPES[settings.search.fusion_type],
+            limit=candidate_limit,
             filters=Filter.by_property("model_name").equal(model_name),
+            rerank=Rerank(prop="guardrails", query=prompt) if rerank_in_weaviate else None,
             return_metadata=MetadataQuery(score=True),
+            include_vector=diversify,
         )
 
-        return [
-            GuardrailResult(
-                id=str(obj.uuid),
-                prompt=obj.properties["prompt"],
-                model_name=obj.properties["model_name"],
-                guardrails=obj.properties["guardrails"],
-                score=obj.metadata.score or 0.0,
-            )
+        hits = [
+            {
+                "id": str(obj.uuid),
+                "prompt": obj.properties["prompt"],
+                "model_name": obj.properties["model_name"],
+                "guardrails": obj.properties["guardrails"],
+                "score": obj.metadata.score or 0.0,
+                "rerank_score": obj.metadata.rerank_score,
+            }
             for obj in results.objects
         ]
 
+        if not rerank.enabled or not hits:
+            return hits
+
+        if rerank_in_weaviate:
+            # Weaviate already reranked the candidate pool, keep the best ones
+            hits.sort(key=lambda h: h["rerank_score"] or 0.0, reverse=True)
+            return hits[:limit]
+
+        if diversify:
+            candidate_vectors = [obj.vector["default"] for obj in results.objects]
+            return self._rerank_mmr(
+                query_vector, hits, candidate_vectors, limit, lambda_=rerank.mmr_lambda
+            )
+
+        return self._rerank(prompt, hits, limit)
+
+    def _rerank(
+        self, prompt: str, candidates: list[dict[str, Any]], limit: int
+    ) -> list[dict[str, Any]]:
+        """Rerank hybrid search candidates with a cross-encoder and keep the top results."""
+        settings = get_settings()
+        cross_encoder = _load_cross_encoder(settings.rerank.model, settings.rerank.backend)
+
+        # Score all candidates in one batched forward pass
+        scores = cross_encoder.predict(
+            [(prompt, f"{c['prompt']} {c['guardrails']}") for c in candidates]
+        )
+        for candidate, rerank_score in zip(candidates, scores):
+            candidate["rerank_score"] = float(rerank_score)
+
+        candidates.sort(key=lambda c: c["rerank_score"], reverse=True)
+        return candidates[:limit]
+
+    def _rerank_mmr(
+        self,
+        query_vector: Any,
+        candidates: list[dict[str, Any]],
+        candidate_vectors: list[Any],
+        limit: int,
+        lambda_: float = 0.5,
+    ) -> list[dict[str, Any]]:
+        """
+        Select a relevant but diverse subset of candidates with maximal marginal relevance.
+
+        Each step picks the candidate maximizing
+        `lambda_ * sim(query, c) - (1 - lambda_) * max(sim(c, selected))`.
+        Similarities are cosines computed with matrix products over the stacked
+        candidate vectors, not per-candidate Python loops.
+        """
+        import numpy as np
+
+        vectors = np.asarray(candidate_vectors, dtype=np.float32)
+        vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        query = np.asarray(query_vector, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        relevance = vectors @ query
+        similarity = vectors @ vectors.T
+
+        # Highest similarity of each candidate to anything selected so far
+        redundancy = np.zeros(len(candidates), dtype=np.float32)
+        available = np.ones(len(candidates), dtype=bool)
+        selected: list[int] = []
+        for _ in range(min(limit, len(candidates))):
+            mmr = lambda_ * relevance - (1 - lambda_) * redundancy
+            mmr[~available] = -np.inf
+            best = int(np.argmax(mmr))
+            selected.append(best)
+            available[best] = False
+            redundancy = np.maximum(redundancy, similarity[best])
+
+        for i in selected:
+            candidates[i]["rerank_score"] = float(relevance[i])
+        return [candidates[i] for i in selected]
+
     def delete_guardrail(self, guardrail_id: str) -> bool:
         """
         Delete a guardrail by ID.
@@ -166,13 +496,15 @@ class WeaviateClient:
         Returns:
             True if deleted, False if not found
         """
-        collection = self.client.collections.get(COLLECTION_NAME)
-        try:
-            collection.data.delete_by_id(guardrail_id)
-            return True
-        except Exception:
+        if not _is_uuid(guardrail_id):
             return False
 
+        # Weaviate answers 404 for unknown IDs, which the client reports as False
+        deleted = self.collection.data.delete_by_id(guardrail_id)
+        if deleted:
+            self._generation += 1
+        return deleted
+
     def get_guardrail(self, guardrail_id: str) -> GuardrailResult | None:
         """
         Get a guardrail by ID.
@@ -183,21 +515,20 @@ class WeaviateClient:
         Returns:
             The guardrail if found, None otherwise
         """
-        collection = self.client.collections.get(COLLECTION_NAME)
-        try:
-            obj = collection.query.fetch_object_by_id(guardrail_id)
-            if obj is None:
-                return None
-            return GuardrailResult(
-                id=str(obj.uuid),
-                prompt=obj.properties["prompt"],
-                model_name=obj.properties["model_name"],
-                guardrails=obj.properties["guardrails"],
-                score=1.0,
-            )
-        except Exception:
+        if not _is_uuid(guardrail_id):
             return None
 
+        obj = self.collection.query.fetch_object_by_id(guardrail_id)
+        if obj is None:
+            return None
+        return GuardrailResult(
+            id=str(obj.uuid),
+            prompt=obj.properties["prompt"],
+            model_name=obj.properties["model_name"],
+            guardrails=obj.properties["guardrails"],
+            score=1.0,
+        )
+
 
 # Singleton instance for convenience
 _client: WeaviateClient | None = None
@@ -1,12 +1,14 @@
 """MCP server for TruthGuards."""
 
-import json
+import asyncio
 from typing import Any
 
+import orjson
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
+from truthguards.core import config
 from truthguards.core.config import get_settings
 from truthguards.core.weaviate_client import WeaviateClient, get_weaviate_client
 
@@ -74,9 +76,9 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle tool calls."""
     client = get_weaviate_client()
 
-    # Ensure client is connected
+    # Ensure client is connected (no-op if the connection is already open)
     try:
-        client.connect()
+        await asyncio.to_thread(client.connect)
     except Exception as e:
         return [TextContent(type="text", text=f"Error connecting to Weaviate: {str(e)}")]
 
@@ -100,17 +102,17 @@ async def handle_add_guardrail(
         return [TextContent(type="text", text="Missing required arguments: prompt, model_name, guardrails")]
 
     # Validate model name
-    settings = get_settings()
-    if settings.models and model_name not in settings.models:
+    if config.MODELS_SET and model_name not in config.MODELS_SET:
         return [
             TextContent(
                 type="text",
-                text=f"Invalid model name '{model_name}'. Available models: {', '.join(settings.models)}",
+                text=f"Invalid model name '{model_name}'. Available models: {', '.join(get_settings().models)}",
             )
         ]
 
     try:
-        guardrail_id = client.add_guardrail(
+        guardrail_id = await asyncio.to_thread(
+            client.add_guardrail,
             prompt=prompt,
             model_name=model_name,
             guardrails=guardrails,
@@ -131,13 +133,14 @@ async def handle_search_guardrails(
     """Handle the search_guardrails tool call."""
     prompt = arguments.get("prompt")
     model_name = arguments.get("model_name")
-    limit = arguments.get("limit", 5)
+    limit = arguments.get("limit", config.DEFAULT_LIMIT)
 
     if not prompt or not model_name:
         return [TextContent(type="text", text="Missing required arguments: prompt, model_name")]
 
     try:
-        results = client.search_guardrails(
+        results = await asyncio.to_thread(
+            client.search_guardrails,
             prompt=prompt,
             model_name=model_name,
             limit=limit,
@@ -169,7 +172,7 @@ async def handle_search_guardrails(
             "results": formatted_results,
         }
 
-        return [TextContent(type="text", text=json.dumps(output, indent=2))]
+        return [TextContent(type="text", text=orjson.dumps(output, option=orjson.OPT_INDENT_2).decode())]
     except Exception as e:
         return [TextContent(type="text", text=f"Error searching guardrails: {str(e)}")]
 
@@ -182,8 +185,6 @@ async def run_server():
 
 def main():
     """Entry point for the MCP server."""
-    import asyncio
-
     asyncio.run(run_server())
 
 
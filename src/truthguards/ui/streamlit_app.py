@@ -1,22 +1,72 @@
 """Streamlit web interface for TruthGuards."""
 
+import asyncio
+import atexit
+import logging
 import os
+import re
 
 import httpx
+import orjson
 import streamlit as st
 
-# API base URL - can be configured via environment variable
-API_BASE_URL = os.environ.get("TRUTHGUARDS_API_URL", "http://localhost:8000")
+# API base URL, used unless the TRUTHGUARDS_API_URL environment variable is set
+DEFAULT_API_BASE_URL = "http://localhost:8000"
+
+# Request bodies are encoded with orjson and sent as raw content
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Connection settings shared by the sync and async clients. Connect errors are
+# retried on the transport, so a brief network drop recovers quickly instead of
+# surfacing as a UI error after one long connect timeout.
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+HTTP_TIMEOUT = httpx.Timeout(connect=1.5, read=10.0, write=5.0, pool=1.0)
+HTTP_RETRIES = 2
+
+logger = logging.getLogger(__name__)
+
+
+def _log_http_version(response: httpx.Response) -> None:
+    """Log the negotiated protocol, to check whether HTTP/2 is in use."""
+    logger.debug("%s %s -> %s", response.request.method, response.url.path, response.http_version)
+
+
+@st.cache_resource
+def get_http_client() -> httpx.Client:
+    """
+    Get the HTTP client shared by all sessions.
+
+    Streamlit re-executes this script on every interaction, so the client is
+    cached as a resource to keep its connection pool, and the keep-alive
+    connections to the API, across reruns. HTTP/2 is negotiated when the API
+    is served over TLS, multiplexing requests on one connection; plain HTTP
+    stays on HTTP/1.1.
+    """
+    client = httpx.Client(
+        base_url=os.environ.get("TRUTHGUARDS_API_URL", DEFAULT_API_BASE_URL),
+        transport=httpx.HTTPTransport(http2=True, limits=HTTP_LIMITS, retries=HTTP_RETRIES),
+        event_hooks={"response": [_log_http_version]},
+        timeout=HTTP_TIMEOUT,
+    )
+    atexit.register(client.close)
+    return client
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_models() -> list[str]:
+    """Fetch available models from the API, cached for five minutes."""
+    response = get_http_client().get("/models")
+    response.raise_for_status()
+    return orjson.loads(response.content).get("models", [])
 
 
 def get_models() -> list[str]:
     """Fetch available models from the API."""
     try:
-        response = httpx.get(f"{API_BASE_URL}/models", timeout=5.0)
-        response.raise_for_status()
-        return response.json().get("models", [])
+        return _fetch_models()
     except Exception:
-        # Fallback to default models if API is not available
+        # Fallback to default models if API is not available. Errors are not
+        # cached, so the API is asked again on the next rerun.
         return [
             "gpt-4",
             "gpt-4-turbo",
@@ -27,34 +77,247 @@ def get_models() -> list[str]:
         ]
 
 
+@st.cache_data(ttl=10, show_spinner=False)
+def _get_health() -> dict | None:
+    """
+    Fetch the API health status, cached for ten seconds.
+
+    Returns None when the API cannot be reached. Unlike the model list, this
+    result is cached too, so a down API costs one probe timeout per ten
+    seconds instead of one per rerun.
+    """
+    try:
+        response = get_http_client().get("/health", timeout=httpx.Timeout(2.0, connect=1.0))
+        return orjson.loads(response.content)
+    except Exception:
+        return None
+
+
 def add_guardrail(prompt: str, model_name: str, guardrails: str) -> dict:
     """Add a guardrail via the API."""
-    response = httpx.post(
-        f"{API_BASE_URL}/guardrails",
-        json={
-            "prompt": prompt,
-            "model_name": model_name,
-            "guardrails": guardrails,
-        },
-        timeout=10.0,
+    response = get_http_client().post(
+        "/guardrails",
+        content=orjson.dumps(
+            {
+                "prompt": prompt,
+                "model_name": model_name,
+                "guardrails": guardrails,
+            }
+        ),
+        headers=JSON_HEADERS,
     )
     response.raise_for_status()
-    return response.json()
+    return orjson.loads(response.content)
 
 
 def search_guardrails(prompt: str, model_name: str, limit: int = 5) -> dict:
     """Search for guardrails via the API."""
-    response = httpx.post(
-        f"{API_BASE_URL}/guardrails/search",
-        json={
-            "prompt": prompt,
-            "model_name": model_name,
-            "limit": limit,
-        },
-        timeout=10.0,
+    response = get_http_client().post(
+        "/guardrails/search",
+        content=orjson.dumps(
+            {
+                "prompt": prompt,
+                "model_name": model_name,
+                "limit": limit,
+            }
+        ),
+        headers=JSON_HEADERS,
     )
     response.raise_for_status()
-    return response.json()
+    return orjson.loads(response.content)
+
+
+def search_guardrails_batch(
+    prompts: list[str], model_name: str, limit: int = 5
+) -> list[dict]:
+    """Search for guardrails for several prompts concurrently, in input order."""
+    return asyncio.run(_asearch_many(prompts, model_name, limit))
+
+
+async def _asearch_many(prompts: list[str], model_name: str, limit: int) -> list[dict]:
+    """Issue one search request per prompt over a single async connection pool."""
+    # AsyncClient is bound to the event loop it was first used on, so unlike the
+    # sync client it cannot be cached across asyncio.run() calls. It reuses the
+    # base URL the sync client already resolved and parsed.
+    async with httpx.AsyncClient(
+        base_url=get_http_client().base_url,
+        transport=httpx.AsyncHTTPTransport(
+            http2=True, limits=HTTP_LIMITS, retries=HTTP_RETRIES
+        ),
+        timeout=HTTP_TIMEOUT,
+    ) as client:
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    "/guardrails/search",
+                    content=orjson.dumps(
+                        {"prompt": prompt, "model_name": model_name, "limit": limit}
+                    ),
+                    headers=JSON_HEADERS,
+                )
+                for prompt in prompts
+            )
+        )
+
+    for response in responses:
+        response.raise_for_status()
+    return [orjson.loads(response.content) for response in responses]
+
+
+def _code_block(text: str) -> str:
+    """Wrap stored text in a code fence so it is shown verbatim, not as markdown."""
+    # The fence must be longer than any backtick run in the text to contain it
+    longest_run = max((len(run) for run in re.findall(r"`+", text)), default=0)
+    fence = "`" * max(3, longest_run + 1)
+    return f"{fence}\n{text}\n{fence}"
+
+
+def format_result(guardrail: dict) -> str:
+    """Format one search result as markdown."""
+    return (
+        f"**Original Prompt Pattern:**\n\n{_code_block(guardrail['prompt'])}\n\n"
+        f"**Guardrail Text:**\n\n{_code_block(guardrail['guardrails'])}\n\n"
+        f"ID: `{guardrail['id']}`"
+    )
+
+
+@st.fragment
+def render_add_form(models: list[str]) -> None:
+    """Render the add guardrail form; submitting only reruns this fragment."""
+    st.header("Add New Guardrail")
+    st.markdown(
+        "Add a guardrail that will be retrieved when similar prompts are processed."
+    )
+
+    with st.form("add_guardrail_form"):
+        add_prompt = st.text_area(
+            "Prompt Pattern",
+            placeholder="Enter the type of prompt or question this guardrail applies to...",
+            help="Describe the kind of prompt this guardrail should be applied to",
+            height=100,
+        )
+
+        add_model = st.selectbox(
+            "LLM Model",
+            options=models,
+            help="Select the model this guardrail is designed for",
+        )
+
+        add_guardrails = st.text_area(
+            "Guardrail Text",
+            placeholder="Enter the guardrail instructions to add to matching prompts...",
+            help="The text that will be added to prompts to prevent hallucinations",
+            height=150,
+        )
+
+        submitted = st.form_submit_button("Add Guardrail", type="primary")
+
+        if submitted:
+            if not add_prompt or not add_guardrails:
+                st.error("Please fill in both the prompt pattern and guardrail text.")
+            else:
+                try:
+                    result = add_guardrail(add_prompt, add_model, add_guardrails)
+                    st.success(f"Guardrail created successfully! ID: {result['id']}")
+                except httpx.HTTPStatusError as e:
+                    st.error(f"Failed to create guardrail: {e.response.text}")
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
+
+
+@st.fragment
+def render_search_form(models: list[str]) -> None:
+    """Render the search form and its results; submitting only reruns this fragment."""
+    st.header("Search Guardrails")
+    st.markdown(
+        "Find relevant guardrails for a given prompt using hybrid search."
+    )
+
+    with st.form("search_guardrails_form"):
+        search_prompt = st.text_area(
+            "Prompt",
+            placeholder="Enter the prompt you want to find guardrails for...",
+            help="The prompt to search for relevant guardrails",
+            height=100,
+        )
+
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            search_model = st.selectbox(
+                "LLM Model",
+                options=models,
+                help="Filter results by model",
+                key="search_model",
+            )
+        with col2:
+            search_limit = st.number_input(
+                "Max Results",
+                min_value=1,
+                max_value=50,
+                value=5,
+                help="Maximum number of guardrails to return",
+            )
+
+        search_submitted = st.form_submit_button("Search", type="primary")
+
+    if search_submitted:
+        if not search_prompt:
+            st.error("Please enter a prompt to search for.")
+        else:
+            try:
+                with st.spinner("Searching..."):
+                    results = search_guardrails(
+                        search_prompt, search_model, search_limit
+                    )
+
+                if results["count"] == 0:
+                    st.info(
+                        f"No guardrails found for model '{search_model}' matching your prompt."
+                    )
+                else:
+                    st.success(f"Found {results['count']} guardrail(s)")
+
+                    top, rest = results["results"][0], results["results"][1:]
+                    with st.expander(
+                        f"**1. Score: {top['score']:.4f}**", expanded=True
+                    ):
+                        st.markdown(format_result(top))
+
+                    # Remaining hits go out as one markdown element rather than an
+                    # expander and four widgets each
+                    if rest:
+                        st.markdown(
+                            "\n\n---\n\n".join(
+                                f"#### {i}. Score: {guardrail['score']:.4f}\n\n"
+                                + format_result(guardrail)
+                                for i, guardrail in enumerate(rest, 2)
+                            )
+                        )
+
+            except httpx.HTTPStatusError as e:
+                st.error(f"Search failed: {e.response.text}")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
+
+
+@st.fragment(run_every=30)
+def render_status() -> None:
+    """Render the API status box, refreshed every 30 seconds on its own."""
+    st.header("Status")
+    if st.button("Refresh"):
+        _fetch_models.clear()
+        _get_health.clear()
+        st.rerun()
+
+    health = _get_health()
+    if health is None:
+        st.error("API: Disconnected")
+    elif health.get("weaviate_connected"):
+        st.success("API: Connected")
+        st.success("Weaviate: Connected")
+    else:
+        st.warning("API: Connected")
+        st.error("Weaviate: Disconnected")
 
 
 def main():
@@ -82,116 +345,11 @@ def main():
 
     # Add Guardrail Tab
     with tab_add:
-        st.header("Add New Guardrail")
-        st.markdown(
-            "Add a guardrail that will be retrieved when similar prompts are processed."
-        )
-
-        with st.form("add_guardrail_form"):
-            add_prompt = st.text_area(
-                "Prompt Pattern",
-                placeholder="Enter the type of prompt or question this guardrail applies to...",
-                help="Describe the kind of prompt this guardrail should be applied to",
-                height=100,
-            )
-
-            add_model = st.selectbox(
-                "LLM Model",
-                options=models,
-                help="Select the model this guardrail is designed for",
-            )
-
-            add_guardrails = st.text_area(
-                "Guardrail Text",
-                placeholder="Enter the guardrail instructions to add to matching prompts...",
-                help="The text that will be added to prompts to prevent hallucinations",
-                height=150,
-            )
-
-            submitted = st.form_submit_button("Add Guardrail", type="primary")
-
-            if submitted:
-                if not add_prompt or not add_guardrails:
-                    st.error("Please fill in both the prompt pattern and guardrail text.")
-                else:
-                    try:
-                        result = add_guardrail(add_prompt, add_model, add_guardrails)
-                        st.success(f"Guardrail created successfully! ID: {result['id']}")
-                    except httpx.HTTPStatusError as e:
-                        st.error(f"Failed to create guardrail: {e.response.text}")
-                    except Exception as e:
-                        st.error(f"Error: {str(e)}")
+        render_add_form(models)
 
     # Search Guardrails Tab
     with tab_search:
-        st.header("Search Guardrails")
-        st.markdown(
-            "Find relevant guardrails for a given prompt using hybrid search."
-        )
-
-        with st.form("search_guardrails_form"):
-            search_prompt = st.text_area(
-                "Prompt",
-                placeholder="Enter the prompt you want to find guardrails for...",
-                help="The prompt to search for relevant guardrails",
-                height=100,
-            )
-
-            col1, col2 = st.columns([2, 1])
-            with col1:
-                search_model = st.selectbox(
-                    "LLM Model",
-                    options=models,
-                    help="Filter results by model",
-                    key="search_model",
-                )
-            with col2:
-                search_limit = st.number_input(
-                    "Max Results",
-                    min_value=1,
-                    max_value=50,
-                    value=5,
-                    help="Maximum number of guardrails to return",
-                )
-
-            search_submitted = st.form_submit_button("Search", type="primary")
-
-        if search_submitted:
-            if not search_prompt:
-                st.error("Please enter a prompt to search for.")
-            else:
-                try:
-                    with st.spinner("Searching..."):
-                        results = search_guardrails(
-                            search_prompt, search_model, search_limit
-                        )
-
-                    if results["count"] == 0:
-                        st.info(
-                            f"No guardrails found for model '{search_model}' matching your prompt."
-                        )
-                    else:
-                        st.success(f"Found {results['count']} guardrail(s)")
-
-                        for i, guardrail in enumerate(results["results"], 1):
-                            with st.expander(
-                                f"**{i}. Score: {guardrail['score']:.4f}**",
-                                expanded=(i == 1),
-                            ):
-                                st.markdown("**Original Prompt Pattern:**")
-                                st.text(guardrail["prompt"])
-
-                                st.markdown("**Guardrail Text:**")
-                                st.markdown(
-                                    f"```\n{guardrail['guardrails']}\n```"
-                                )
-
-                                st.caption(f"ID: {guardrail['id']}")
-
-                except httpx.HTTPStatusError as e:
-                    st.error(f"Search failed: {e.response.text}")
-                except Exception as e:
-                    st.error(f"Error: {str(e)}")
+        render_search_form(models)
 
     # Sidebar with info
     with st.sidebar:
@@ -215,18 +373,7 @@ def main():
         st.divider()
 
         # Health check
-        st.header("Status")
-        try:
-            response = httpx.get(f"{API_BASE_URL}/health", timeout=2.0)
-            health = response.json()
-            if health.get("weaviate_connected"):
-                st.success("API: Connected")
-                st.success("Weaviate: Connected")
-            else:
-                st.warning("API: Connected")
-                st.error("Weaviate: Disconnected")
-        except Exception:
-            st.error("API: Disconnected")
+        render_status()
 
 
 if __name__ == "__main__":
@@ -1,25 +1,27 @@
 """Pytest fixtures for TruthGuards tests."""
 
 import sys
+from dataclasses import asdict
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock, patch
 
 import pytest
-from fastapi.testclient import TestClient
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_weaviate_client():
     """Create a mock Weaviate client."""
-    mock_client = MagicMock()
+    import weaviate
+
+    mock_client = Mock(spec=weaviate.WeaviateClient)
     mock_client.is_ready.return_value = True
     return mock_client
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_guardrail_results():
     """Sample guardrail search results."""
     from truthguards.core.weaviate_client import GuardrailResult
@@ -42,29 +44,66 @@ def mock_guardrail_results():
     ]
 
 
-@pytest.fixture
-def mock_weaviate_module(mock_weaviate_client, mock_guardrail_results):
-    """Patch the Weaviate client module."""
-    mock_instance = MagicMock()
+def _configure_weaviate_mock(mock_instance, mock_weaviate_client, mock_guardrail_results):
+    """Set the default return values of the mocked WeaviateClient."""
+    from truthguards.core.weaviate_client import BulkInsertResult
+
     mock_instance.client = mock_weaviate_client
     mock_instance.connect.return_value = None
     mock_instance.close.return_value = None
+    mock_instance.is_ready.return_value = True
     mock_instance.add_guardrail.return_value = "new-guardrail-id"
+    mock_instance.add_guardrails_bulk.return_value = BulkInsertResult(
+        ids=["bulk-id-1", "bulk-id-2"], failed=[]
+    )
     mock_instance.search_guardrails.return_value = mock_guardrail_results
+    mock_instance.search_guardrails_raw.return_value = [asdict(r) for r in mock_guardrail_results]
     mock_instance.get_guardrail.return_value = mock_guardrail_results[0]
     mock_instance.delete_guardrail.return_value = True
 
-    with patch("truthguards.api.routes.get_weaviate_client", return_value=mock_instance):
-        with patch("truthguards.api.main.get_weaviate_client", return_value=mock_instance):
-            yield mock_instance
 
-
-@pytest.fixture
-def test_client(mock_weaviate_module):
-    """Create a test client for the FastAPI app."""
+@pytest.fixture(scope="session")
+def mock_weaviate_module(mock_weaviate_client, mock_guardrail_results):
+    """Patch the Weaviate client singleton for the whole session."""
+    from truthguards.core.weaviate_client import WeaviateClient
+
+    mock_instance = Mock(spec=WeaviateClient)
+    _configure_weaviate_mock(mock_instance, mock_weaviate_client, mock_guardrail_results)
+
+    # Replacing the singleton covers every module that imported get_weaviate_client
+    with patch("truthguards.core.weaviate_client._client", mock_instance):
+        yield mock_instance
+
+
+@pytest.fixture(autouse=True)
+def reset_weaviate_mock(request):
+    """Restore the shared Weaviate mock so per-test overrides do not leak."""
+    yield
+    if "mock_weaviate_module" in request.fixturenames:
+        mock_instance = request.getfixturevalue("mock_weaviate_module")
+        mock_instance.reset_mock(return_value=True, side_effect=True)
+        _configure_weaviate_mock(
+            mock_instance,
+            request.getfixturevalue("mock_weaviate_client"),
+            request.getfixturevalue("mock_guardrail_results"),
+        )
+
+
+@pytest.fixture(scope="session")
+def app(mock_weaviate_module):
+    """Import the FastAPI app once the Weaviate client is mocked."""
     from truthguards.api.main import app
 
-    return TestClient(app)
+    return app
+
+
+@pytest.fixture(scope="session")
+def test_client(app):
+    """Create a test client for the FastAPI app, running its lifespan once."""
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as client:
+        yield client
 
 
 @pytest.fixture
@@ -82,4 +121,7 @@ def patched_settings(mock_settings):
     """Patch get_settings to return mock settings."""
     with patch("truthguards.core.config.get_settings", return_value=mock_settings):
         with patch("truthguards.api.routes.get_settings", return_value=mock_settings):
-            yield mock_settings
+            with patch(
+                "truthguards.core.config.MODELS_SET", frozenset(mock_settings.models)
+            ):
+                yield mock_settings
@@ -1,14 +1,18 @@
 """Tests for the FastAPI API endpoints."""
 
+import json
+
 import pytest
 
+from truthguards.api.schemas import BulkGuardrailCreate, GuardrailCreate, SearchRequest
+
 
 class TestHealthEndpoint:
     """Tests for the health check endpoint."""
 
     def test_health_check_healthy(self, test_client, mock_weaviate_module):
         """Test health check when Weaviate is connected."""
-        mock_weaviate_module.client.is_ready.return_value = True
+        mock_weaviate_module.is_ready.return_value = True
 
         response = test_client.get("/health")
 
@@ -19,7 +23,7 @@ class TestHealthEndpoint:
 
     def test_health_check_degraded(self, test_client, mock_weaviate_module):
         """Test health check when Weaviate is disconnected."""
-        mock_weaviate_module.client.is_ready.side_effect = Exception("Connection failed")
+        mock_weaviate_module.is_ready.return_value = False
 
         response = test_client.get("/health")
 
@@ -50,11 +54,11 @@ class TestGuardrailsEndpoints:
         """Test creating a new guardrail."""
         response = test_client.post(
             "/guardrails",
-            json={
-                "prompt": "What is the capital of France?",
-                "model_name": "gpt-4",
-                "guardrails": "Always verify factual information.",
-            },
+            json=GuardrailCreate.model_construct(
+                prompt="What is the capital of France?",
+                model_name="gpt-4",
+                guardrails="Always verify factual information.",
+            ).model_dump(),
         )
 
         assert response.status_code == 201
@@ -67,25 +71,105 @@ class TestGuardrailsEndpoints:
         """Test creating guardrail with invalid model name."""
         response = test_client.post(
             "/guardrails",
-            json={
-                "prompt": "Test prompt",
-                "model_name": "invalid-model",
-                "guardrails": "Test guardrails",
-            },
+            json=GuardrailCreate.model_construct(
+                prompt="Test prompt",
+                model_name="invalid-model",
+                guardrails="Test guardrails",
+            ).model_dump(),
         )
 
         assert response.status_code == 400
         assert "Invalid model name" in response.json()["detail"]
 
+    def test_create_guardrails_bulk(self, test_client, mock_weaviate_module, patched_settings):
+        """Test creating guardrails in bulk."""
+        response = test_client.post(
+            "/guardrails/bulk",
+            json=BulkGuardrailCreate.model_construct(
+                guardrails=[
+                    GuardrailCreate.model_construct(
+                        prompt="What is the capital of France?",
+                        model_name="gpt-4",
+                        guardrails="Always verify factual information.",
+                    ),
+                    GuardrailCreate.model_construct(
+                        prompt="Tell me about historical events",
+                        model_name="claude-3-opus",
+                        guardrails="Cross-reference historical facts.",
+                    ),
+                ]
+            ).model_dump(),
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["ids"] == ["bulk-id-1", "bulk-id-2"]
+        assert data["count"] == 2
+        items = mock_weaviate_module.add_guardrails_bulk.call_args.args[0]
+        assert [i["model_name"] for i in items] == ["gpt-4", "claude-3-opus"]
+
+    def test_create_guardrails_bulk_partial_failure(
+        self, test_client, mock_weaviate_module, patched_settings
+    ):
+        """Test that a partially failed batch returns the stored IDs and the failed items."""
+        from truthguards.core.weaviate_client import BulkInsertResult
+
+        mock_weaviate_module.add_guardrails_bulk.return_value = BulkInsertResult(
+            ids=["bulk-id-1"],
+            failed=[{"index": 1, "message": "vectorizer unavailable"}],
+        )
+
+        response = test_client.post(
+            "/guardrails/bulk",
+            json=BulkGuardrailCreate.model_construct(
+                guardrails=[
+                    GuardrailCreate.model_construct(
+                        prompt="Test 1", model_name="gpt-4", guardrails="Test"
+                    ),
+                    GuardrailCreate.model_construct(
+                        prompt="Test 2", model_name="gpt-4", guardrails="Test"
+                    ),
+                ]
+            ).model_dump(),
+        )
+
+        assert response.status_code == 207
+        data = response.json()
+        assert data["ids"] == ["bulk-id-1"]
+        assert data["count"] == 1
+        assert data["failed"] == [{"index": 1, "message": "vectorizer unavailable"}]
+
+    def test_create_guardrails_bulk_invalid_model(
+        self, test_client, mock_weaviate_module, patched_settings
+    ):
+        """Test that one invalid model name rejects the whole batch."""
+        response = test_client.post(
+            "/guardrails/bulk",
+            json=BulkGuardrailCreate.model_construct(
+                guardrails=[
+                    GuardrailCreate.model_construct(
+                        prompt="Test", model_name="gpt-4", guardrails="Test"
+                    ),
+                    GuardrailCreate.model_construct(
+                        prompt="Test", model_name="invalid-model", guardrails="Test"
+                    ),
+                ]
+            ).model_dump(),
+        )
+
+        assert response.status_code == 400
+        assert "invalid-model" in response.json()["detail"]
+        mock_weaviate_module.add_guardrails_bulk.assert_not_called()
+
     def test_search_guardrails(self, test_client, mock_weaviate_module):
         """Test searching for guardrails."""
         response = test_client.post(
             "/guardrails/search",
-            json={
-                "prompt": "Tell me about Paris",
-                "model_name": "gpt-4",
-                "limit": 5,
-            },
+            json=SearchRequest.model_construct(
+                prompt="Tell me about Paris",
+                model_name="gpt-4",
+                limit=5,
+            ).model_dump(),
         )
 
         assert response.status_code == 200
@@ -96,23 +180,94 @@ class TestGuardrailsEndpoints:
         assert len(data["results"]) == 2
         assert data["results"][0]["score"] == 0.95
 
-    def test_search_guardrails_no_results(self, test_client, mock_weaviate_module):
-        """Test searching when no results found."""
-        mock_weaviate_module.search_guardrails.return_value = []
+    def test_search_guardrails_alpha_override(self, test_client, mock_weaviate_module):
+        """Test that a per-request alpha is forwarded to the client."""
+        response = test_client.post(
+            "/guardrails/search",
+            json=SearchRequest.model_construct(
+                prompt="Tell me about Paris",
+                model_name="gpt-4",
+                alpha=0.3,
+            ).model_dump(),
+        )
+
+        assert response.status_code == 200
+        assert mock_weaviate_module.search_guardrails_raw.call_args.kwargs["alpha"] == 0.3
+
+    def test_search_guardrails_invalid_alpha(self, test_client, mock_weaviate_module):
+        """Test that alpha outside [0, 1] is rejected."""
+        response = test_client.post(
+            "/guardrails/search",
+            json={
+                "prompt": "Tell me about Paris",
+                "model_name": "gpt-4",
+                "alpha": 1.5,
+            },
+        )
 
+        assert response.status_code == 422
+
+    def test_search_guardrails_unknown_field(self, test_client, mock_weaviate_module):
+        """Test that unknown request fields are rejected."""
         response = test_client.post(
             "/guardrails/search",
             json={
-                "prompt": "Unrelated query",
+                "prompt": "Tell me about Paris",
                 "model_name": "gpt-4",
+                "top_k": 5,
             },
         )
 
+        assert response.status_code == 422
+
+    def test_search_guardrails_no_results(self, test_client, mock_weaviate_module):
+        """Test searching when no results found."""
+        mock_weaviate_module.search_guardrails_raw.return_value = []
+
+        response = test_client.post(
+            "/guardrails/search",
+            json=SearchRequest.model_construct(
+                prompt="Unrelated query",
+                model_name="gpt-4",
+            ).model_dump(),
+        )
+
         assert response.status_code == 200
         data = response.json()
         assert data["count"] == 0
         assert data["results"] == []
 
+    def test_search_guardrails_stream(self, test_client, mock_weaviate_module):
+        """Test streaming search results as newline-delimited JSON."""
+        response = test_client.post(
+            "/guardrails/search/stream",
+            json=SearchRequest.model_construct(
+                prompt="Tell me about Paris",
+                model_name="gpt-4",
+            ).model_dump(),
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["id"] for line in lines] == ["test-id-1", "test-id-2"]
+        assert lines[0]["score"] == 0.95
+
+    def test_search_guardrails_stream_error(self, test_client, mock_weaviate_module):
+        """Test that search errors are reported before streaming starts."""
+        mock_weaviate_module.search_guardrails_raw.side_effect = Exception("Weaviate down")
+
+        response = test_client.post(
+            "/guardrails/search/stream",
+            json=SearchRequest.model_construct(
+                prompt="Tell me about Paris",
+                model_name="gpt-4",
+            ).model_dump(),
+        )
+
+        assert response.status_code == 500
+        assert "Weaviate down" in response.json()["detail"]
+
     def test_get_guardrail(self, test_client, mock_weaviate_module):
         """Test getting a guardrail by ID."""
         response = test_client.get("/guardrails/test-id-1")
@@ -145,12 +300,58 @@ class TestGuardrailsEndpoints:
         assert response.status_code == 404
 
 
+class TestMiddleware:
+    """Tests for compression and CORS middleware."""
+
+    def test_large_response_gzipped(self, test_client, mock_weaviate_module):
+        """Test that responses above the size threshold are gzip-compressed."""
+        mock_weaviate_module.search_guardrails_raw.return_value = [
+            {
+                "id": f"test-id-{i}",
+                "prompt": "What is the capital of France?",
+                "model_name": "gpt-4",
+                "guardrails": "The capital of France is Paris. " * 10,
+                "score": 0.9,
+                "rerank_score": None,
+            }
+            for i in range(5)
+        ]
+
+        response = test_client.post(
+            "/guardrails/search",
+            json={"prompt": "capital of France", "model_name": "gpt-4"},
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["count"] == 5
+
+    def test_small_response_not_gzipped(self, test_client, mock_weaviate_module):
+        """Test that small responses are sent uncompressed."""
+        response = test_client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+
+    def test_cors_rejects_unknown_origin(self, test_client):
+        """Test that CORS preflight is only allowed for configured origins."""
+        response = test_client.options(
+            "/health",
+            headers={
+                "Origin": "https://evil.example",
+                "Access-Control-Request-Method": "GET",
+            },
+        )
+
+        assert "access-control-allow-origin" not in response.headers
+
+
 class TestAPIV1Prefix:
     """Tests for API v1 prefixed endpoints."""
 
     def test_v1_health(self, test_client, mock_weaviate_module):
         """Test health endpoint with v1 prefix."""
-        mock_weaviate_module.client.is_ready.return_value = True
+        mock_weaviate_module.is_ready.return_value = True
 
         response = test_client.get("/api/v1/health")
 
@@ -0,0 +1,148 @@
+"""Tests for the local ONNX Runtime embedder."""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("onnxruntime")
+tokenizers = pytest.importorskip("tokenizers")
+
+EMBEDDING_DIM = 4
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    """Create a model directory with a small word-level tokenizer."""
+    vocab = {"[PAD]": 0, "[UNK]": 1, "hello": 2, "world": 3, "guardrails": 4}
+    tokenizer = tokenizers.Tokenizer(tokenizers.models.WordLevel(vocab, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = tokenizers.pre_tokenizers.Whitespace()
+    tokenizer.save(str(tmp_path / "tokenizer.json"))
+    return tmp_path
+
+
+@pytest.fixture
+def mock_session():
+    """Create a mock ONNX session returning token embeddings derived from token ids."""
+    session = MagicMock()
+    session.get_inputs.return_value = [MagicMock(), MagicMock()]
+    session.get_inputs.return_value[0].name = "input_ids"
+    session.get_inputs.return_value[1].name = "attention_mask"
+
+    def run(output_names, inputs):
+        ids = inputs["input_ids"].astype(np.float32)
+        return [np.repeat(ids[..., np.newaxis], EMBEDDING_DIM, axis=2) + 1]
+
+    session.run.side_effect = run
+    return session
+
+
+@pytest.fixture
+def embedder(model_dir, mock_session):
+    """Create a LocalEmbedder backed by the mock session."""
+    with patch("truthguards.core.embeddings.ort.InferenceSession", return_value=mock_session):
+        from truthguards.core.embeddings import LocalEmbedder
+
+        yield LocalEmbedder(model_dir, cache_size=8)
+
+
+class TestModelLoading:
+    """Tests for choosing between the quantized and FP32 models."""
+
+    @pytest.mark.parametrize(
+        ("quantized", "model_file"), [(True, "model-int8.onnx"), (False, "model.onnx")]
+    )
+    def test_model_file(self, model_dir, mock_session, quantized, model_file):
+        """Test that the quantized flag selects the model file."""
+        with patch(
+            "truthguards.core.embeddings.ort.InferenceSession", return_value=mock_session
+        ) as mock_inference_session:
+            from truthguards.core.embeddings import LocalEmbedder
+
+            LocalEmbedder(model_dir, quantized=quantized)
+
+        assert mock_inference_session.call_args.args[0] == str(model_dir / model_file)
+
+
+class TestLocalEmbedder:
+    """Tests for LocalEmbedder."""
+
+    def test_encode_returns_normalized_vector(self, embedder):
+        """Test that encode returns a unit-length float32 vector."""
+        vector = embedder.encode("hello world")
+
+        assert vector.shape == (EMBEDDING_DIM,)
+        assert vector.dtype == np.float32
+        assert np.isclose(np.linalg.norm(vector), 1.0)
+
+    def test_encode_cached(self, embedder, mock_session):
+        """Test that repeated texts reuse the cached vector."""
+        first = embedder.encode("hello world")
+        second = embedder.encode("hello world")
+
+        assert first is second
+        assert mock_session.run.call_count == 1
+        assert not first.flags.writeable
+
+    def test_encode_batch_ignores_padding(self, embedder, mock_session):
+        """Test that padding tokens do not contribute to the pooled vector."""
+        mock_session.run.side_effect = lambda _, inputs: [
+            np.ones((*inputs["input_ids"].shape, EMBEDDING_DIM), dtype=np.float32)
+            * (inputs["attention_mask"][..., np.newaxis] * 2 - 1)
+        ]
+
+        vectors = embedder.encode_batch(["hello", "hello world guardrails"])
+
+        assert vectors.shape == (2, EMBEDDING_DIM)
+        # Padded positions carry -1 embeddings, so they would flip the sign if pooled
+        assert np.allclose(vectors[0], vectors[1])
+        assert (vectors > 0).all()
+
+    def test_encode_many_sorts_by_length(self, embedder, mock_session):
+        """Test that encode_many pads each mini-batch to its own length and keeps input order."""
+        texts = ["hello " * 20, "hello", "world " * 10, "guardrails"]
+
+        vectors = embedder.encode_many(texts, batch_size=2)
+
+        batches = [call.args[1]["input_ids"] for call in mock_session.run.call_args_list]
+        assert [batch.shape[1] for batch in batches] == [8, 24]
+        assert np.shares_memory(batches[0], batches[1])
+        assert np.allclose(vectors, embedder.encode_batch(texts))
+
+
+class TestEmbeddingBatcher:
+    """Tests for EmbeddingBatcher."""
+
+    @pytest.fixture
+    def mock_embedder(self):
+        """Create a mock embedder returning one row per text."""
+        embedder = MagicMock()
+        embedder.encode_batch.side_effect = lambda texts: np.arange(
+            len(texts), dtype=np.float32
+        )[:, np.newaxis]
+        return embedder
+
+    def test_concurrent_encodes_share_a_batch(self, mock_embedder):
+        """Test that concurrent encode calls are embedded in one forward pass."""
+        from truthguards.core.embeddings import EmbeddingBatcher
+
+        batcher = EmbeddingBatcher(mock_embedder, max_batch=8, max_wait=0.5)
+        texts = [f"text {i}" for i in range(4)]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            vectors = list(pool.map(batcher.encode, texts))
+
+        assert mock_embedder.encode_batch.call_count == 1
+        assert sorted(mock_embedder.encode_batch.call_args.args[0]) == texts
+        assert len(vectors) == 4
+
+    def test_encode_error_propagates(self, mock_embedder):
+        """Test that a failed forward pass raises in every waiting caller."""
+        from truthguards.core.embeddings import EmbeddingBatcher
+
+        mock_embedder.encode_batch.side_effect = RuntimeError("session failed")
+        batcher = EmbeddingBatcher(mock_embedder, max_wait=0)
+
+        with pytest.raises(RuntimeError, match="session failed"):
+            batcher.encode("text")
@@ -1,9 +1,14 @@
 """Tests for the Weaviate client."""
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+TEST_UUID = "5f8b3c2a-1d4e-4f6a-9b7c-8d9e0f1a2b3c"
+
 
 class TestWeaviateClient:
     """Tests for WeaviateClient class."""
@@ -14,6 +19,7 @@ class TestWeaviateClient:
             mock_settings.return_value.weaviate.host = "localhost"
             mock_settings.return_value.weaviate.port = 8080
             mock_settings.return_value.weaviate.grpc_port = 50051
+            mock_settings.return_value.search.cache_ttl = 0
 
             from truthguards.core.weaviate_client import WeaviateClient
 
@@ -25,7 +31,9 @@ class TestWeaviateClient:
 
     def test_client_custom_settings(self):
         """Test client initialization with custom settings."""
-        with patch("truthguards.core.weaviate_client.get_settings"):
+        with patch("truthguards.core.weaviate_client.get_settings") as mock_settings:
+            mock_settings.return_value.search.cache_ttl = 0
+
             from truthguards.core.weaviate_client import WeaviateClient
 
             client = WeaviateClient(
@@ -73,6 +81,12 @@ class TestWeaviateClientMethods:
             mock_settings.return_value.weaviate.grpc_port = 50051
             mock_settings.return_value.search.default_limit = 5
             mock_settings.return_value.search.alpha = 0.5
+            mock_settings.return_value.search.fusion_type = "ranked"
+            mock_settings.return_value.search.cache_size = 16
+            mock_settings.return_value.search.cache_ttl = 30
+            mock_settings.return_value.rerank.enabled = False
+            mock_settings.return_value.embeddings.enabled = False
+            mock_settings.return_value.embeddings.ingest = False
 
             from truthguards.core.weaviate_client import WeaviateClient
 
@@ -98,6 +112,137 @@ class TestWeaviateClientMethods:
         mock_collection.data.insert.assert_called_once()
         assert result_id is not None
 
+    def test_add_guardrails_bulk_uses_batch(self, mock_client):
+        """Test that add_guardrails_bulk streams objects through a fixed-size batch."""
+        mock_collection = MagicMock()
+        mock_collection.batch.failed_objects = []
+        mock_client._client.collections.get.return_value = mock_collection
+        batch = mock_collection.batch.fixed_size.return_value.__enter__.return_value
+
+        result = mock_client.add_guardrails_bulk(
+            [
+                {"prompt": "Prompt 1", "model_name": "gpt-4", "guardrails": "Guardrail 1"},
+                {"prompt": "Prompt 2", "model_name": "gpt-4", "guardrails": "Guardrail 2"},
+            ]
+        )
+
+        mock_collection.batch.fixed_size.assert_called_once()
+        assert batch.add_object.call_count == 2
+        assert len(result.ids) == 2
+        assert result.failed == []
+        assert batch.add_object.call_args_list[0].kwargs["uuid"] == result.ids[0]
+
+    def test_add_guardrails_bulk_partial_failure(self, mock_client):
+        """Test that failed batch objects are reported by index without dropping the rest."""
+        mock_collection = MagicMock()
+        mock_client._client.collections.get.return_value = mock_collection
+        batch = mock_collection.batch.fixed_size.return_value.__enter__.return_value
+
+        def fail_second(**kwargs):
+            if kwargs["properties"]["prompt"] == "Prompt 2":
+                mock_collection.batch.failed_objects = [
+                    MagicMock(message="vectorizer unavailable", original_uuid=kwargs["uuid"])
+                ]
+
+        mock_collection.batch.failed_objects = []
+        batch.add_object.side_effect = fail_second
+
+        result = mock_client.add_guardrails_bulk(
+            [
+                {"prompt": "Prompt 1", "model_name": "gpt-4", "guardrails": "Guardrail 1"},
+                {"prompt": "Prompt 2", "model_name": "gpt-4", "guardrails": "Guardrail 2"},
+            ]
+        )
+
+        assert result.ids == [batch.add_object.call_args_list[0].kwargs["uuid"]]
+        assert result.failed == [{"index": 1, "message": "vectorizer unavailable"}]
+
+    def test_add_guardrails_bulk_all_failed(self, mock_client):
+        """Test that an error is raised when no object could be inserted."""
+        mock_collection = MagicMock()
+        mock_client._client.collections.get.return_value = mock_collection
+        batch = mock_collection.batch.fixed_size.return_value.__enter__.return_value
+        batch.add_object.side_effect = lambda **kwargs: setattr(
+            mock_collection.batch,
+            "failed_objects",
+            [MagicMock(message="vectorizer unavailable", original_uuid=kwargs["uuid"])],
+        )
+
+        with pytest.raises(RuntimeError, match="vectorizer unavailable"):
+            mock_client.add_guardrails_bulk(
+                [{"prompt": "Prompt", "model_name": "gpt-4", "guardrails": "Guardrail"}]
+            )
+
+    def test_add_guardrails_bulk_concurrent_calls(self, mock_client):
+        """Test that concurrent bulk inserts each report only their own failures."""
+        both_batching = threading.Barrier(2, timeout=5)
+
+        class FakeBatchWrapper:
+            """Mimics weaviate's per-Collection batch wrapper, reset by fixed_size()."""
+
+            def __init__(self):
+                self.failed_objects = []
+
+            @contextmanager
+            def fixed_size(self, **kwargs):
+                self.failed_objects = []
+                batch = MagicMock()
+
+                def add_object(properties, uuid, vector):
+                    if properties["prompt"].startswith("fail"):
+                        self.failed_objects.append(
+                            MagicMock(message="vectorizer unavailable", original_uuid=uuid)
+                        )
+
+                batch.add_object.side_effect = add_object
+                both_batching.wait()  # Keep both requests inside a batch at once
+                yield batch
+
+        def get_collection(name):
+            collection = MagicMock()
+            collection.batch = FakeBatchWrapper()
+            return collection
+
+        mock_client._client.collections.get.side_effect = get_collection
+        requests = [
+            [
+                {"prompt": "ok a", "model_name": "gpt-4", "guardrails": "Guardrail"},
+                {"prompt": "fail a", "model_name": "gpt-4", "guardrails": "Guardrail"},
+            ],
+            [
+                {"prompt": "ok b", "model_name": "gpt-4", "guardrails": "Guardrail"},
+                {"prompt": "ok b", "model_name": "gpt-4", "guardrails": "Guardrail"},
+            ],
+        ]
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first, second = pool.map(mock_client.add_guardrails_bulk, requests)
+
+        assert len(first.ids) == 1
+        assert first.failed == [{"index": 1, "message": "vectorizer unavailable"}]
+        assert len(second.ids) == 2
+        assert second.failed == []
+
+    def test_add_guardrail_local_embedding(self, mock_client):
+        """Test that ingest embeddings are computed locally and sent with the insert."""
+        from truthguards.core.weaviate_client import get_settings
+
+        get_settings.return_value.embeddings.ingest = True
+
+        mock_collection = MagicMock()
+        mock_client._client.collections.get.return_value = mock_collection
+
+        mock_batcher = MagicMock()
+        mock_batcher.encode.return_value.tolist.return_value = [0.1, 0.2]
+
+        with patch("truthguards.core.embeddings.get_batcher", return_value=mock_batcher):
+            mock_client.add_guardrail(
+                prompt="Test prompt", model_name="gpt-4", guardrails="Test guardrails"
+            )
+
+        mock_batcher.encode.assert_called_once_with("Test prompt Test guardrails")
+        assert mock_collection.data.insert.call_args.kwargs["vector"] == [0.1, 0.2]
+
     def test_search_guardrails_calls_hybrid(self, mock_client):
         """Test that search_guardrails calls hybrid query."""
         mock_collection = MagicMock()
@@ -126,29 +271,339 @@ class TestWeaviateClientMethods:
         assert len(results) == 1
         assert results[0].score == 0.9
 
+    def test_search_guardrails_raw_returns_dicts(self, mock_client):
+        """Test that search_guardrails_raw returns plain dicts."""
+        mock_collection = MagicMock()
+        mock_client._client.collections.get.return_value = mock_collection
+
+        mock_obj = MagicMock()
+        mock_obj.uuid = "test-uuid"
+        mock_obj.properties = {
+            "prompt": "Test",
+            "model_name": "gpt-4",
+            "guardrails": "Test guardrails",
+        }
+        mock_obj.metadata.score = 0.9
+        mock_obj.metadata.rerank_score = None
+        mock_collection.query.hybrid.return_value.objects = [mock_obj]
+
+        results = mock_client.search_guardrails_raw(prompt="Test query", model_name="gpt-4")
+
+        assert results == [
+            {
+                "id": "test-uuid",
+                "prompt": "Test",
+                "model_name": "gpt-4",
+                "guardrails": "Test guardrails",
+                "score": 0.9,
+                "rerank_score": None,
+            }
+        ]
+
+    def test_search_guardrails_alpha_and_fusion(self, mock_client):
+        """Test that alpha overrides the default and rank fusion is used."""
+        from weaviate.classes.query import HybridFusion
+
+        mock_collection = MagicMock()
+        mock_collection.query.hybrid.return_value.objects = []
+        mock_client._client.collections.get.return_value = mock_collection
+
+        mock_client.search_guardrails(prompt="Test query", model_name="gpt-4", alpha=0.2)
+
+        hybrid_kwargs = mock_collection.query.hybrid.call_args.kwargs
+        assert hybrid_kwargs["alpha"] == 0.2
+        assert hybrid_kwargs["fusion_type"] == HybridFusion.RANKED
+
+    def test_search_guardrails_rerank(self, mock_client):
+        """Test that reranking widens the candidate pool and reorders results."""
+        from truthguards.core.weaviate_client import get_settings
+
+        get_settings.return_value.rerank.enabled = True
+        get_settings.return_value.rerank.provider = "cross-encoder"
+        get_settings.return_value.rerank.candidate_multiplier = 4
+
+        mock_collection = MagicMock()
+        mock_client._client.collections.get.return_value = mock_collection
+
+        mock_objects = []
+        for i, score in enumerate([0.9, 0.8, 0.7]):
+            mock_obj = MagicMock()
+            mock_obj.uuid = f"uuid-{i}"
+            mock_obj.properties = {
+                "prompt": f"Prompt {i}",
+                "model_name": "gpt-4",
+                "guardrails": f"Guardrail {i}",
+            }
+            mock_obj.metadata.score = score
+            mock_objects.append(mock_obj)
+        mock_collection.query.hybrid.return_value.objects = mock_objects
+
+        mock_cross_encoder = MagicMock()
+        mock_cross_encoder.predict.return_value = [0.1, 0.3, 0.9]
+
+        with patch(
+            "truthguards.core.weaviate_client._load_cross_encoder",
+            return_value=mock_cross_encoder,
+        ):
+            results = mock_client.search_guardrails(
+                prompt="Test query", model_name="gpt-4", limit=2
+            )
+
+        assert mock_collection.query.hybrid.call_args.kwargs["limit"] == 8
+        mock_cross_encoder.predict.assert_called_once()
+        assert [r.id for r in results] == ["uuid-2", "uuid-1"]
+        assert results[0].score == 0.7
+        assert results[0].rerank_score == 0.9
+
+    def test_search_guardrails_weaviate_rerank(self, mock_client):
+        """Test that the weaviate rerank provider reranks inside the hybrid query."""
+        from truthguards.core.weaviate_client import get_settings
+
+        get_settings.return_value.rerank.enabled = True
+        get_settings.return_value.rerank.provider = "weaviate"
+        get_settings.return_value.rerank.candidate_multiplier = 2
+
+        mock_collection = MagicMock()
+        mock_client._client.collections.get.return_value = mock_collection
+
+        mock_objects = []
+        for i, rerank_score in enumerate([0.2, 0.9, 0.5]):
+            mock_obj = MagicMock()
+            mock_obj.uuid = f"uuid-{i}"
+            mock_obj.properties = {
+                "prompt": f"Prompt {i}",
+                "model_name": "gpt-4",
+                "guardrails": f"Guardrail {i}",
+            }
+            mock_obj.metadata.score = 0.5
+            mock_obj.metadata.rerank_score = rerank_score
+            mock_objects.append(mock_obj)
+        mock_collection.query.hybrid.return_value.objects = mock_objects
+
+        with patch("truthguards.core.weaviate_client._load_cross_encoder") as mock_load:
+            results = mock_client.search_guardrails(
+                prompt="Test query", model_name="gpt-4", limit=2
+            )
+
+        mock_load.assert_not_called()
+        hybrid_kwargs = mock_collection.query.hybrid.call_args.kwargs
+        assert hybrid_kwargs["limit"] == 4
+        assert hybrid_kwargs["rerank"] is not None
+        assert [r.id for r in results] == ["uuid-1", "uuid-2"]
+        assert results[0].rerank_score == 0.9
+
+    def test_search_guardrails_mmr(self, mock_client):
+        """Test that the mmr provider skips near-duplicate candidates."""
+        np = pytest.importorskip("numpy")
+        from truthguards.core.weaviate_client import get_settings
+
+        get_settings.return_value.rerank.enabled = True
+        get_settings.return_value.rerank.provider = "mmr"
+        get_settings.return_value.rerank.candidate_multiplier = 2
+        get_settings.return_value.rerank.mmr_lambda = 0.3
+
+        mock_collection = MagicMock()
+        mock_client._client.collections.get.return_value = mock_collection
+
+        # Two near-identical guardrails close to the query, one distinct guardrail
+        candidate_vectors = [[1.0, 0.0, 0.0], [0.99, 0.05, 0.0], [0.6, 0.0, 0.8]]
+        mock_objects = []
+        for i, candidate_vector in enumerate(candidate_vectors):
+            mock_obj = MagicMock()
+            mock_obj.uuid = f"uuid-{i}"
+            mock_obj.properties = {
+                "prompt": f"Prompt {i}",
+                "model_name": "gpt-4",
+                "guardrails": f"Guardrail {i}",
+            }
+            mock_obj.metadata.score = 0.5
+            mock_obj.vector = {"default": candidate_vector}
+            mock_objects.append(mock_obj)
+        mock_collection.query.hybrid.return_value.objects = mock_objects
+
+        mock_embedder = MagicMock()
+        mock_embedder.encode.return_value = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+
+        with patch("truthguards.core.embeddings.get_embedder", return_value=mock_embedder):
+            results = mock_client.search_guardrails(
+                prompt="Test query", model_name="gpt-4", limit=2
+            )
+
+        assert mock_collection.query.hybrid.call_args.kwargs["include_vector"] is True
+        assert [r.id for r in results] == ["uuid-0", "uuid-2"]
+        assert results[0].rerank_score == pytest.approx(1.0)
+
+    def test_search_guardrails_local_embedding(self, mock_client):
+        """Test that a locally computed query vector is sent with the hybrid query."""
+        from truthguards.core.weaviate_client import get_settings
+
+        get_settings.return_value.embeddings.enabled = True
+
+        mock_collection = MagicMock()
+        mock_collection.query.hybrid.return_value.objects = []
+        mock_client._client.collections.get.return_value = mock_collection
+
+        mock_embedder = MagicMock()
+        mock_embedder.encode.return_value.tolist.return_value = [0.1, 0.2, 0.3]
+
+        with patch("truthguards.core.embeddings.get_embedder", return_value=mock_embedder):
+            mock_client.search_guardrails(prompt="Test query", model_name="gpt-4")
+
+        mock_embedder.encode.assert_called_once_with("Test query")
+        assert mock_collection.query.hybrid.call_args.kwargs["vector"] == [0.1, 0.2, 0.3]
+
+    def test_search_guardrails_cached(self, mock_client):
+        """Test that identical searches are served from the cache."""
+        mock_collection = MagicMock()
+        mock_collection.query.hybrid.return_value.objects = []
+        mock_client._client.collections.get.return_value = mock_collection
+
+        mock_client.search_guardrails(prompt="Test query", model_name="gpt-4")
+        mock_client.search_guardrails(prompt="Test query", model_name="gpt-4")
+        mock_client.search_guardrails(prompt="Test query", model_name="gpt-4", alpha=0.1)
+
+        assert mock_collection.query.hybrid.call_count == 2
+
+    def test_search_cache_invalidated_on_write(self, mock_client):
+        """Test that adding a guardrail invalidates cached searches."""
+        mock_collection = MagicMock()
+        mock_collection.query.hybrid.return_value.objects = []
+        mock_client._client.collections.get.return_value = mock_collection
+
+        mock_client.search_guardrails(prompt="Test query", model_name="gpt-4")
+        mock_client.add_guardrail(prompt="Test", model_name="gpt-4", guardrails="Test")
+        mock_client.search_guardrails(prompt="Test query", model_name="gpt-4")
+
+        assert mock_collection.query.hybrid.call_count == 2
+
     def test_delete_guardrail_success(self, mock_client):
         """Test successful guardrail deletion."""
         mock_collection = MagicMock()
+        mock_collection.data.delete_by_id.return_value = True
         mock_client._client.collections.get.return_value = mock_collection
 
-        result = mock_client.delete_guardrail("test-id")
+        result = mock_client.delete_guardrail(TEST_UUID)
 
         assert result is True
-        mock_collection.data.delete_by_id.assert_called_once_with("test-id")
+        mock_collection.data.delete_by_id.assert_called_once_with(TEST_UUID)
 
     def test_delete_guardrail_failure(self, mock_client):
         """Test guardrail deletion when not found."""
         mock_collection = MagicMock()
-        mock_collection.data.delete_by_id.side_effect = Exception("Not found")
+        mock_collection.data.delete_by_id.return_value = False
+        mock_client._client.collections.get.return_value = mock_collection
+
+        result = mock_client.delete_guardrail(TEST_UUID)
+
+        assert result is False
+
+    def test_delete_guardrail_invalid_id(self, mock_client):
+        """Test that a non-UUID id is rejected without calling Weaviate."""
+        mock_collection = MagicMock()
         mock_client._client.collections.get.return_value = mock_collection
 
         result = mock_client.delete_guardrail("non-existent-id")
 
         assert result is False
+        mock_collection.data.delete_by_id.assert_not_called()
+
+    def test_delete_guardrail_connection_error(self, mock_client):
+        """Test that Weaviate errors are raised instead of reported as not found."""
+        mock_collection = MagicMock()
+        mock_collection.data.delete_by_id.side_effect = Exception("Connection failed")
+        mock_client._client.collections.get.return_value = mock_collection
+
+        with pytest.raises(Exception, match="Connection failed"):
+            mock_client.delete_guardrail(TEST_UUID)
+
+    def test_get_guardrail_not_found(self, mock_client):
+        """Test getting a guardrail that does not exist."""
+        mock_collection = MagicMock()
+        mock_collection.query.fetch_object_by_id.return_value = None
+        mock_client._client.collections.get.return_value = mock_collection
+
+        assert mock_client.get_guardrail(TEST_UUID) is None
+        assert mock_client.get_guardrail("non-existent-id") is None
+        mock_collection.query.fetch_object_by_id.assert_called_once_with(TEST_UUID)
+
+    def test_connect_reuses_open_connection(self, mock_client):
+        """Test that connect does not reconnect while the connection is open."""
+        mock_client._client.is_connected.return_value = True
+
+        with patch("truthguards.core.weaviate_client.weaviate.connect_to_local") as mock_connect:
+            mock_client.connect()
+
+        mock_connect.assert_not_called()
+
+    def test_concurrent_lazy_connect_opens_one_connection(self, mock_client):
+        """Test that concurrent first calls share a single new connection."""
+        mock_client._client = None
+
+        def connect_to_local(**kwargs):
+            threading.Event().wait(0.05)  # Let the other threads queue up
+            return MagicMock()
+
+        with patch(
+            "truthguards.core.weaviate_client.weaviate.connect_to_local",
+            side_effect=connect_to_local,
+        ) as mock_connect:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda _: mock_client.is_ready(), range(8)))
+
+        mock_connect.assert_called_once()
+
+    def test_reconnect_closes_stale_client(self, mock_client):
+        """Test that a disconnected client is closed before reconnecting."""
+        stale = mock_client._client
+        stale.is_connected.return_value = False
+
+        with patch("truthguards.core.weaviate_client.weaviate.connect_to_local") as mock_connect:
+            mock_client.connect()
+
+        stale.close.assert_called_once()
+        assert mock_client._client is mock_connect.return_value
+
+    def test_ensure_collection_checked_once(self, mock_client):
+        """Test that the collection existence check is cached."""
+        mock_client._client.collections.exists.return_value = True
+
+        mock_client._ensure_collection()
+        mock_client._ensure_collection()
+
+        mock_client._client.collections.exists.assert_called_once()
+
+    def test_is_ready_cached(self, mock_client):
+        """Test that readiness probes are cached for a short time."""
+        mock_client._client.is_ready.return_value = True
+
+        assert mock_client.is_ready() is True
+        assert mock_client.is_ready() is True
+
+        mock_client._client.is_ready.assert_called_once()
+
+    def test_is_ready_connection_error(self, mock_client):
+        """Test that readiness is False when Weaviate cannot be reached."""
+        mock_client._client.is_ready.side_effect = Exception("Connection failed")
+
+        assert mock_client.is_ready() is False
+
+    def test_collection_handle_cached(self, mock_client):
+        """Test that the collection handle is looked up once and reused."""
+        mock_collection = MagicMock()
+        mock_client._client.collections.get.return_value = mock_collection
+
+        mock_client.add_guardrail(prompt="Test", model_name="gpt-4", guardrails="Test")
+        mock_client.delete_guardrail(TEST_UUID)
+
+        mock_client._client.collections.get.assert_called_once()
 
     def test_close_connection(self, mock_client):
         """Test closing the connection."""
+        mock_weaviate = mock_client._client
+        assert mock_client.collection is not None
+
         mock_client.close()
 
-        mock_client._client.close.assert_called_once()
+        mock_weaviate.close.assert_called_once()
         assert mock_client._client is None
+        assert mock_client._collection is None